@@ -1,10 +1,138 @@
 """Abstract base class for content processors."""
+import asyncio
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from urllib.parse import urlparse
+import aiohttp
+
+
+# Process-wide HTTP session shared by all processors (created lazily)
+_session: Optional[aiohttp.ClientSession] = None
+
+# Per-host limits on concurrent outgoing requests (created lazily), kept
+# as an LRU of at most MAX_HOST_SEMAPHORES hosts
+_host_semaphores: "OrderedDict[str, asyncio.Semaphore]" = OrderedDict()
+MAX_HOST_SEMAPHORES = 1024
+
+# Default maximum concurrent requests to a single host across all processors
+DEFAULT_MAX_REQUESTS_PER_HOST = 8
 
 
 class ContentProcessor(ABC):
     """Abstract base class for content processors."""
 
+    def __init__(self, max_requests_per_host: int = DEFAULT_MAX_REQUESTS_PER_HOST):
+        """Initialize content processor.
+
+        Args:
+            max_requests_per_host: Maximum concurrent requests to a single
+                host; host limits are shared by all processors, so the
+                first processor to contact a host sets its limit
+        """
+        self.max_requests_per_host = max_requests_per_host
+
+    @classmethod
+    async def get_session(cls) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use.
+
+        A single pooled session lets keep-alive connections and DNS lookups
+        be reused across extractions instead of paying a new TCP/TLS
+        handshake per request.
+
+        Returns:
+            Shared aiohttp client session
+        """
+        global _session
+        if _session is None or _session.closed:
+            _session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=20,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=75
+                )
+            )
+        return _session
+
+    @classmethod
+    async def close_session(cls) -> None:
+        """Close the shared HTTP session if it was created."""
+        global _session
+        if _session is not None and not _session.closed:
+            await _session.close()
+        _session = None
+        _host_semaphores.clear()
+
+    def host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """Get the semaphore limiting concurrent requests to a URL's host.
+
+        Bounding per-host concurrency avoids bursts of parallel requests
+        tripping rate limits (HTTP 429) and triggering retry storms.
+
+        Args:
+            url: Request URL
+
+        Returns:
+            Semaphore shared by all requests to that host
+        """
+        host = urlparse(url).netloc.lower()
+        semaphore = _host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_requests_per_host)
+            _host_semaphores[host] = semaphore
+            # Forget the least recently used hosts; by then their requests
+            # have normally finished
+            while len(_host_semaphores) > MAX_HOST_SEMAPHORES:
+                _host_semaphores.popitem(last=False)
+        else:
+            _host_semaphores.move_to_end(host)
+        return semaphore
+
+    async def race_first_ok(self, urls: List[str], timeout: float = 10) -> Optional[Tuple[str, str]]:
+        """Request several URLs concurrently and return the first successful body.
+
+        Remaining requests are cancelled as soon as one returns HTTP 200.
+
+        Args:
+            urls: Candidate URLs
+            timeout: Per-request timeout in seconds
+
+        Returns:
+            Tuple of (url, body) for the first 200 response, or None if all failed
+        """
+        session = await self.get_session()
+
+        async def fetch(url: str) -> Optional[Tuple[str, str]]:
+            try:
+                async with self.host_semaphore(url), \
+                        session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                    if response.status == 200:
+                        return url, await response.text()
+            except Exception:
+                # Any failure (network, timeout, bad body) only rules out this candidate
+                pass
+            return None
+
+        tasks = [asyncio.create_task(fetch(url)) for url in urls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                if result is not None:
+                    return result
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            # Wait for the cancelled requests to unwind and release their connections
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        return None
+
+    async def close(self) -> None:
+        """Release processor-specific resources (worker pools etc.)."""
+        pass
+
     @abstractmethod
     async def extract_content(self, url: str) -> str:
         """Extract content from URL and return as markdown.
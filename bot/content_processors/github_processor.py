@@ -1,7 +1,17 @@
 """GitHub repository content processor."""
+import os
 import re
+import asyncio
+from typing import Optional
 import aiohttp
 from bot.content_processors.base import ContentProcessor
+from bot.utils.cache import TTLCache
+
+
+REPO_URL_PATTERN = re.compile(r'github\.com/([^/]+)/([^/]+)')
+
+# README text keyed by (owner, repo) to absorb repeated links
+_readme_cache = TTLCache(maxsize=256, ttl=600)
 
 
 class GitHubProcessor(ContentProcessor):
@@ -19,8 +29,7 @@ class GitHubProcessor(ContentProcessor):
         Raises:
             ValueError: If URL cannot be parsed
         """
-        pattern = r'github\.com/([^/]+)/([^/]+)'
-        match = re.search(pattern, url)
+        match = REPO_URL_PATTERN.search(url)
 
         if not match:
             raise ValueError(f"Could not parse GitHub URL: {url}")
@@ -47,8 +56,36 @@ class GitHubProcessor(ContentProcessor):
             Exception: If content extraction fails
         """
         owner, repo = self._parse_github_url(url)
+        cache_key = (owner.lower(), repo.lower())
+        cached = _readme_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-        # Try to fetch README using GitHub raw content
+        content = await self._fetch_readme_any(owner, repo)
+        _readme_cache.set(cache_key, content)
+        return content
+
+    async def _fetch_readme_any(self, owner: str, repo: str) -> str:
+        """Fetch README text from whichever source has it.
+
+        Args:
+            owner: Repository owner
+            repo: Repository name
+
+        Returns:
+            README content
+
+        Raises:
+            Exception: If no README could be found
+        """
+        session = await self.get_session()
+
+        # Ask the GitHub API for the README (any filename, default branch)
+        content = await self._fetch_readme_api(session, owner, repo)
+        if content is not None:
+            return content.strip()
+
+        # Fall back to guessing raw README locations (e.g. when rate-limited)
         readme_urls = [
             f"https://raw.githubusercontent.com/{owner}/{repo}/main/README.md",
             f"https://raw.githubusercontent.com/{owner}/{repo}/master/README.md",
@@ -58,18 +95,51 @@ class GitHubProcessor(ContentProcessor):
             f"https://raw.githubusercontent.com/{owner}/{repo}/master/readme.md",
         ]
 
-        async with aiohttp.ClientSession() as session:
-            for readme_url in readme_urls:
-                try:
-                    async with session.get(readme_url, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                        if response.status == 200:
-                            content = await response.text()
-                            return content.strip()
-                except:
-                    continue
+        # Race all candidates; the first one that exists wins
+        result = await self.race_first_ok(readme_urls)
+        if result is not None:
+            _, content = result
+            return content.strip()
 
         raise Exception(f"Could not find README for {owner}/{repo}. Repository may not have a README file.")
 
+    async def _fetch_readme_api(
+        self,
+        session: aiohttp.ClientSession,
+        owner: str,
+        repo: str
+    ) -> Optional[str]:
+        """Fetch README through the GitHub REST API.
+
+        Uses GITHUB_TOKEN from the environment, if set, for a higher rate limit.
+
+        Args:
+            session: HTTP session to use
+            owner: Repository owner
+            repo: Repository name
+
+        Returns:
+            Raw README text, or None if the API request did not succeed
+        """
+        headers = {
+            'Accept': 'application/vnd.github.raw',
+            'User-Agent': 'summarizator'
+        }
+        token = os.getenv("GITHUB_TOKEN")
+        if token:
+            headers['Authorization'] = f"Bearer {token}"
+
+        api_url = f"https://api.github.com/repos/{owner}/{repo}/readme"
+        try:
+            async with self.host_semaphore(api_url), \
+                    session.get(api_url, headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as response:
+                if response.status == 200:
+                    # README contents are always UTF-8, so decode directly
+                    return (await response.read()).decode('utf-8', errors='replace')
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass
+        return None
+
     async def get_document_name(self, url: str, content: str) -> str:
         """Generate short document name from repository name.
 
@@ -91,7 +161,7 @@ class GitHubProcessor(ContentProcessor):
                     name = name[:57] + "..."
 
             return name
-        except:
+        except ValueError:
             return "GitHub Repository"
 
     def get_prompt_template_name(self) -> str:
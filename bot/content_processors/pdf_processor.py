@@ -1,11 +1,89 @@
 """PDF content processor."""
+import io
 import os
+import re
+import asyncio
+import multiprocessing
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import List, Optional
 import aiohttp
 import aiofiles
 from pypdf import PdfReader
 from bot.content_processors.base import ContentProcessor
+from bot.utils.cache import TTLCache
+
+try:
+    import pymupdf
+except ImportError:  # pragma: no cover - optional, faster backend
+    pymupdf = None
+
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+PAGES_PER_TASK = 32
+
+# Upper bound on page extraction worker processes
+MAX_PDF_WORKERS = 4
+
+# First line whose first non-blank character isn't a markdown heading marker
+FIRST_TEXT_LINE_PATTERN = re.compile(r'^[^\S\n]*([^\s#].*)$', re.MULTILINE)
+
+# Extracted PDF text keyed by URL to absorb repeated links
+_content_cache = TTLCache(maxsize=64, ttl=600)
+
+# Worker processes for page extraction (created lazily)
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Get the shared page extraction process pool."""
+    global _executor
+    if _executor is None:
+        # Workers are started from a clean server process rather than forked,
+        # since forking the threaded bot can copy locks held by other threads
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _executor = ProcessPoolExecutor(
+            max_workers=min(MAX_PDF_WORKERS, os.cpu_count() or 1),
+            mp_context=multiprocessing.get_context(start_method)
+        )
+    return _executor
+
+
+def _count_pages(path: str) -> int:
+    """Count pages in a PDF file."""
+    if pymupdf is not None:
+        try:
+            with pymupdf.open(path) as doc:
+                return doc.page_count
+        except pymupdf.FileDataError:
+            pass
+
+    return len(PdfReader(path).pages)
+
+
+def _remove_file(path: str) -> None:
+    """Delete a file if it exists."""
+    if os.path.exists(path):
+        os.unlink(path)
+
+
+def _extract_page_texts(path: str, start: int, stop: int) -> List[str]:
+    """Extract raw text of pages [start, stop) from a PDF file.
+
+    Runs inside worker processes, so the file is opened here rather than
+    passing parsed document objects around. Uses PyMuPDF when installed and
+    falls back to pypdf otherwise, or when PyMuPDF cannot open the file.
+    """
+    if pymupdf is not None:
+        try:
+            with pymupdf.open(path) as doc:
+                return [doc[i].get_text("text") for i in range(start, stop)]
+        except pymupdf.FileDataError:
+            pass
+
+    reader = PdfReader(path)
+    return [reader.pages[i].extract_text() for i in range(start, stop)]
 
 
 class PDFProcessor(ContentProcessor):
@@ -23,40 +101,85 @@ class PDFProcessor(ContentProcessor):
         Raises:
             Exception: If content extraction fails
         """
+        cached = _content_cache.get(url)
+        if cached is not None:
+            return cached
+
         # Download PDF to temporary file
         temp_file = None
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=60)) as response:
-                    response.raise_for_status()
-                    content = await response.read()
-
-            # Write to temporary file
             with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp:
                 temp_file = tmp.name
-                tmp.write(content)
 
-            # Extract text using pypdf
-            reader = PdfReader(temp_file)
-            text_parts = []
+            # Stream the body to disk in chunks instead of buffering it in memory
+            session = await self.get_session()
+            async with aiofiles.open(temp_file, 'wb') as f:
+                async with self.host_semaphore(url), \
+                        session.get(url, timeout=aiohttp.ClientTimeout(total=60)) as response:
+                    response.raise_for_status()
+                    async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                        await f.write(chunk)
 
-            for page_num, page in enumerate(reader.pages, 1):
-                text = page.extract_text()
-                if text.strip():
-                    text_parts.append(f"## Page {page_num}\n\n{text.strip()}")
+            content = await self._extract_text(temp_file)
 
-            if not text_parts:
+            if not content:
                 raise Exception("No text could be extracted from PDF")
 
-            return '\n\n'.join(text_parts)
+            _content_cache.set(url, content)
+            return content
 
         except Exception as e:
             raise Exception(f"Failed to extract PDF content: {str(e)}")
 
         finally:
             # Clean up temporary file
-            if temp_file and os.path.exists(temp_file):
-                os.unlink(temp_file)
+            if temp_file:
+                await asyncio.to_thread(_remove_file, temp_file)
+
+    async def _extract_text(self, path: str) -> str:
+        """Extract text from a PDF file as '## Page N' markdown sections.
+
+        Pages are split into batches that are extracted in parallel worker
+        processes, keeping the event loop free for other requests.
+
+        Args:
+            path: Path to the PDF file
+
+        Returns:
+            Markdown content, empty if no page contains text
+        """
+        loop = asyncio.get_running_loop()
+        executor = _get_executor()
+
+        # Opening the file to count pages is cheap, so do it in a thread
+        # rather than paying a round trip to the process pool
+        num_pages = await asyncio.to_thread(_count_pages, path)
+        batches = await asyncio.gather(*(
+            loop.run_in_executor(
+                executor,
+                _extract_page_texts,
+                path,
+                start,
+                min(start + PAGES_PER_TASK, num_pages)
+            )
+            for start in range(0, num_pages, PAGES_PER_TASK)
+        ))
+
+        return self._format_pages(text for batch in batches for text in batch)
+
+    @staticmethod
+    def _format_pages(texts) -> str:
+        """Format raw page texts as markdown sections, skipping empty pages."""
+        # Write sections into a single buffer instead of a list plus a join
+        buf = io.StringIO()
+        for page_num, text in enumerate(texts, 1):
+            text = text.strip()
+            if text:
+                if buf.tell():
+                    buf.write('\n\n')
+                buf.write(f"## Page {page_num}\n\n")
+                buf.write(text)
+        return buf.getvalue()
 
     async def get_document_name(self, url: str, content: str) -> str:
         """Generate short document name from PDF filename or first heading.
@@ -81,18 +204,23 @@ class PDFProcessor(ContentProcessor):
                 name = name[:57] + "..."
             return name
 
-        # Try to extract first heading from content
-        lines = content.split('\n')
-        for line in lines:
-            line = line.strip()
-            if line and not line.startswith('#'):
-                # Use first non-empty, non-heading line
-                if len(line) > 60:
-                    line = line[:57] + "..."
-                return line
+        # Use first non-empty, non-heading line from content
+        match = FIRST_TEXT_LINE_PATTERN.search(content)
+        if match:
+            line = match.group(1).strip()
+            if len(line) > 60:
+                line = line[:57] + "..."
+            return line
 
         return "PDF Document"
 
+    async def close(self) -> None:
+        """Shut down the page extraction process pool."""
+        global _executor
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
     def get_prompt_template_name(self) -> str:
         """Return name of prompt template to use.
 
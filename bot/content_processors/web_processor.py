@@ -1,19 +1,40 @@
 """Web page content processor."""
+import re
 import aiohttp
-from bs4 import BeautifulSoup
-import html2text
-from bot.content_processors.base import ContentProcessor
+from bs4 import BeautifulSoup, SoupStrainer
+from markdownify import MarkdownConverter
+from bot.content_processors.base import ContentProcessor, DEFAULT_MAX_REQUESTS_PER_HOST
+from bot.utils.cache import TTLCache
+
+
+# Runs of two or more blank (or whitespace-only) lines
+BLANK_LINES_PATTERN = re.compile(r'\n(?:[ \t]*\n){2,}')
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (compatible; SummarizatorBot/1.0; +https://github.com/yourrepo/summarizator)'
+}
 
 
 class WebProcessor(ContentProcessor):
     """Processor for web pages (HTML to markdown)."""
 
-    def __init__(self):
-        """Initialize web processor."""
-        self.html_converter = html2text.HTML2Text()
-        self.html_converter.ignore_links = False
-        self.html_converter.ignore_images = True
-        self.html_converter.body_width = 0  # Don't wrap text
+    def __init__(self, max_requests_per_host: int = DEFAULT_MAX_REQUESTS_PER_HOST):
+        """Initialize web processor.
+
+        Args:
+            max_requests_per_host: Maximum concurrent requests to a single host
+        """
+        super().__init__(max_requests_per_host)
+        # Converts the parsed tree directly, without re-serializing to HTML
+        self.markdown_converter = MarkdownConverter(
+            heading_style='ATX',
+            strip=['img'],  # Ignore images, keep links
+            wrap=False  # Don't wrap text
+        )
+
+        # Page titles seen during extraction, keyed by URL, so that
+        # get_document_name doesn't need to fetch the page again
+        self._titles = TTLCache(maxsize=256, ttl=600)
 
     async def extract_content(self, url: str) -> str:
         """Extract content from web page and convert to markdown.
@@ -27,36 +48,28 @@ class WebProcessor(ContentProcessor):
         Raises:
             Exception: If content extraction fails
         """
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (compatible; SummarizatorBot/1.0; +https://github.com/yourrepo/summarizator)'
-        }
+        session = await self.get_session()
+        async with self.host_semaphore(url), \
+                session.get(url, headers=HEADERS, timeout=aiohttp.ClientTimeout(total=30)) as response:
+            response.raise_for_status()
+            html = await response.text()
 
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                response.raise_for_status()
-                html = await response.text()
+        # Parse HTML (lxml is C-backed and much faster than html.parser)
+        soup = BeautifulSoup(html, 'lxml')
 
-        # Parse HTML
-        soup = BeautifulSoup(html, 'html.parser')
+        # Remember the title for get_document_name
+        title_tag = soup.find('title')
+        self._titles.set(url, self._title_text(title_tag))
 
         # Remove script and style elements
         for script in soup(["script", "style", "nav", "footer", "header"]):
             script.decompose()
 
-        # Convert to markdown
-        markdown = self.html_converter.handle(str(soup))
+        # Convert to markdown (body only, so <head> text like the title is skipped)
+        markdown = self.markdown_converter.convert_soup(soup.body or soup)
 
         # Clean up excessive newlines
-        lines = markdown.split('\n')
-        cleaned_lines = []
-        prev_empty = False
-        for line in lines:
-            is_empty = not line.strip()
-            if not (is_empty and prev_empty):
-                cleaned_lines.append(line)
-            prev_empty = is_empty
-
-        return '\n'.join(cleaned_lines).strip()
+        return BLANK_LINES_PATTERN.sub('\n\n', markdown).strip()
 
     async def get_document_name(self, url: str, content: str) -> str:
         """Generate short document name from page title.
@@ -68,20 +81,20 @@ class WebProcessor(ContentProcessor):
         Returns:
             Short, readable document name
         """
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (compatible; SummarizatorBot/1.0; +https://github.com/yourrepo/summarizator)'
-        }
+        title = self._titles.get(url)
 
-        # Try to extract title from content
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
+        if title is None:
+            # Not extracted through this processor, fetch the page for its title
+            session = await self.get_session()
+            async with self.host_semaphore(url), \
+                    session.get(url, headers=HEADERS, timeout=aiohttp.ClientTimeout(total=30)) as response:
                 html = await response.text()
 
-        soup = BeautifulSoup(html, 'html.parser')
-        title_tag = soup.find('title')
+            # Only the <title> element is needed, so skip building the rest of the tree
+            soup = BeautifulSoup(html, 'lxml', parse_only=SoupStrainer('title'))
+            title = self._title_text(soup.find('title'))
 
-        if title_tag and title_tag.string:
-            title = title_tag.string.strip()
+        if title:
             # Truncate if too long
             if len(title) > 60:
                 title = title[:57] + "..."
@@ -92,6 +105,13 @@ class WebProcessor(ContentProcessor):
         parsed = urlparse(url)
         return parsed.netloc or "Web Page"
 
+    @staticmethod
+    def _title_text(title_tag) -> str:
+        """Get stripped text of a <title> tag, or empty string if missing."""
+        if title_tag and title_tag.string:
+            return title_tag.string.strip()
+        return ""
+
     def get_prompt_template_name(self) -> str:
         """Return name of prompt template to use.
 
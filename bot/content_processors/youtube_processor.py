@@ -1,32 +1,121 @@
 """YouTube video content processor using youtube-transcript-api + yt-dlp."""
 import re
-import time
 import asyncio
-from typing import Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+import aiohttp
 import yt_dlp
 from youtube_transcript_api import YouTubeTranscriptApi
-from bot.content_processors.base import ContentProcessor
+from bot.content_processors.base import ContentProcessor, DEFAULT_MAX_REQUESTS_PER_HOST
+from bot.utils.cache import TTLCache
+
+
+# Covers watch?v=, youtu.be/, embed/ and v/ links
+VIDEO_ID_PATTERN = re.compile(r'(?:youtube\.com/(?:watch\?v=|embed/|v/)|youtu\.be/)([^&?/]+)')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+# Tags never span caption lines, so they are stripped once from the newline-joined text
+VTT_TAG_PATTERN = re.compile(r'<[^>\n]+>')
+# Caption text lines: skips headers, NOTE/STYLE blocks, cue numbers and timings
+VTT_TEXT_PATTERN = re.compile(
+    r'^[^\S\n]*(?!WEBVTT|NOTE|STYLE|::cue|\d+[^\S\n]*$)(?!.*-->)(\S.*)$',
+    re.MULTILINE
+)
+
+INFO_YDL_OPTS = {
+    'skip_download': True,
+    'quiet': True,
+    'no_warnings': True,
+}
+
+# Dedicated pool for blocking yt-dlp / transcript calls, so they don't
+# starve the event loop's default executor (created lazily)
+_executor: Optional[ThreadPoolExecutor] = None
+
+# Limits concurrent blocking YouTube calls (created lazily)
+_youtube_semaphore: Optional[asyncio.Semaphore] = None
+MAX_CONCURRENT_YOUTUBE_CALLS = 4
+
+# Per-thread YoutubeDL instances for metadata extraction, also tracked
+# in a list so they can be closed on shutdown
+_ydl_local = threading.local()
+_info_ydls: List[yt_dlp.YoutubeDL] = []
+
+# Video metadata and transcripts keyed by video ID, so youtu.be and
+# youtube.com links to the same video share entries. Metadata is cut down
+# by _slim_info first, as full yt-dlp info dicts can take megabytes each.
+_info_cache = TTLCache(maxsize=256, ttl=600)
+_transcript_cache = TTLCache(maxsize=256, ttl=600)
+
+
+def _slim_info(info: dict) -> dict:
+    """Keep only the yt-dlp info fields the processor reads.
+
+    Caption tracks are reduced to their VTT URLs, but every caption
+    language is kept, as the subtitle download fallback tries them all.
+
+    Args:
+        info: Full info dict from YoutubeDL.extract_info
+
+    Returns:
+        Info dict with title, duration, language, subtitles and automatic_captions
+    """
+    def vtt_tracks(captions: Optional[dict]) -> dict:
+        return {
+            lang: [
+                {'ext': 'vtt', 'url': track['url']}
+                for track in tracks
+                if track.get('ext') == 'vtt' and track.get('url')
+            ]
+            for lang, tracks in (captions or {}).items()
+        }
+
+    slim = {key: info[key] for key in ('title', 'duration', 'language') if key in info}
+    slim['subtitles'] = vtt_tracks(info.get('subtitles'))
+    slim['automatic_captions'] = vtt_tracks(info.get('automatic_captions'))
+    return slim
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the dedicated YouTube thread pool."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='ytproc')
+    return _executor
+
+
+def _get_info_ydl() -> yt_dlp.YoutubeDL:
+    """Get the calling thread's metadata YoutubeDL instance, creating it once.
+
+    Constructing YoutubeDL loads all extractors, so instances are reused
+    across calls; keeping one per worker thread avoids sharing it between
+    concurrent extractions.
+    """
+    ydl = getattr(_ydl_local, 'info_ydl', None)
+    if ydl is None:
+        ydl = yt_dlp.YoutubeDL(INFO_YDL_OPTS)
+        _ydl_local.info_ydl = ydl
+        _info_ydls.append(ydl)
+    return ydl
 
 
 class YouTubeProcessor(ContentProcessor):
     """Processor for YouTube videos (extracts captions)."""
 
-    def __init__(self):
-        """Initialize YouTube processor."""
+    def __init__(self, max_requests_per_host: int = DEFAULT_MAX_REQUESTS_PER_HOST):
+        """Initialize YouTube processor.
+
+        Args:
+            max_requests_per_host: Maximum concurrent requests to a single host
+        """
+        super().__init__(max_requests_per_host)
         self._last_video_info = None
 
     def _extract_video_id(self, url: str) -> str:
         """Extract YouTube video ID from URL."""
-        patterns = [
-            r'(?:youtube\.com/watch\?v=|youtu\.be/)([^&\?/]+)',
-            r'youtube\.com/embed/([^&\?/]+)',
-            r'youtube\.com/v/([^&\?/]+)'
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
+        match = VIDEO_ID_PATTERN.search(url)
+        if match:
+            return match.group(1)
 
         raise ValueError(f"Could not extract video ID from URL: {url}")
 
@@ -49,55 +138,113 @@ class YouTubeProcessor(ContentProcessor):
         """
         try:
             video_id = self._extract_video_id(url)
-            loop = asyncio.get_event_loop()
 
             # Step 1: Get metadata via yt-dlp (non-blocking)
-            info = await loop.run_in_executor(None, lambda: self._get_video_info(url))
+            info = await self._run_blocking(self._get_video_info, url)
             self._last_video_info = info
 
+            cached = _transcript_cache.get(video_id)
+            if cached is not None:
+                return cached
+
             # Detect the video's original language
             original_lang = info.get('language', 'en') if info else 'en'
 
             # Step 2: Try youtube-transcript-api with retry on 429
-            rate_limited = False
-            subtitle_text, rate_limited = await loop.run_in_executor(
-                None,
-                lambda: self._fetch_transcript(video_id, original_lang)
+            subtitle_text, rate_limited = await self._run_with_backoff(
+                self._fetch_transcript,
+                video_id,
+                original_lang
             )
 
-            # Step 3: Fall back to yt-dlp subtitle download (skip if rate-limited — same endpoint)
+            # Step 3: Fall back to caption URLs from yt-dlp metadata, then to a
+            # full yt-dlp subtitle download (skip if rate-limited — same endpoint)
+            if not subtitle_text and not rate_limited:
+                subtitle_text = await self._fetch_transcript_direct(original_lang, info)
             if not subtitle_text and not rate_limited:
-                subtitle_text = await loop.run_in_executor(
-                    None,
-                    lambda: self._fetch_transcript_ytdlp(url, original_lang, info)
-                )
+                subtitle_text = await self._fetch_transcript_ytdlp(url, original_lang, info)
 
             if not subtitle_text:
                 if rate_limited:
                     raise Exception("YouTube is rate-limiting caption requests. Please try again in a few minutes.")
                 raise Exception("No subtitles or captions available for this video")
 
-            subtitle_text = re.sub(r'\s+', ' ', subtitle_text).strip()
-            return f"# YouTube Video Transcript\n\n{subtitle_text}"
+            content = f"# YouTube Video Transcript\n\n{subtitle_text}"
+            _transcript_cache.set(video_id, content)
+            return content
 
         except Exception as e:
             raise Exception(f"Failed to extract YouTube captions: {str(e)}")
 
     def _get_video_info(self, url: str) -> Optional[dict]:
-        """Get video metadata via yt-dlp."""
+        """Get video metadata via yt-dlp (cached per video ID)."""
         try:
-            ydl_opts = {
-                'skip_download': True,
-                'quiet': True,
-                'no_warnings': True,
-            }
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                return ydl.extract_info(url, download=False)
+            video_id = self._extract_video_id(url)
+        except ValueError:
+            video_id = None
+
+        if video_id:
+            cached = _info_cache.get(video_id)
+            if cached is not None:
+                return cached
+
+        try:
+            info = _get_info_ydl().extract_info(url, download=False)
         except Exception:
             return None
+        if not info:
+            return None
+
+        info = _slim_info(info)
+        if video_id:
+            _info_cache.set(video_id, info)
+        return info
+
+    async def _run_blocking(self, func, *args):
+        """Run a blocking yt-dlp / transcript call on the dedicated pool.
+
+        At most MAX_CONCURRENT_YOUTUBE_CALLS run at once, so parallel video
+        extractions can't saturate the pool or hammer YouTube.
+
+        Args:
+            func: Blocking callable
+            *args: Arguments for func
+
+        Returns:
+            Result of func
+        """
+        global _youtube_semaphore
+        if _youtube_semaphore is None:
+            _youtube_semaphore = asyncio.Semaphore(MAX_CONCURRENT_YOUTUBE_CALLS)
+
+        async with _youtube_semaphore:
+            return await asyncio.get_running_loop().run_in_executor(_get_executor(), func, *args)
+
+    async def _run_with_backoff(self, func, *args) -> tuple:
+        """Run a single-attempt blocking fetch on the pool, retrying on 429.
+
+        Backoff waits happen on the event loop, so no worker thread is held
+        while sleeping.
+
+        Args:
+            func: Blocking callable returning (result or None, rate_limited bool)
+            *args: Arguments for func
+
+        Returns:
+            Tuple of (result or None, rate_limited bool); rate_limited is True
+            only when every attempt was rate-limited
+        """
+        for attempt in range(3):
+            result, rate_limited = await self._run_blocking(func, *args)
+            if not rate_limited:
+                return result, False
+            if attempt < 2:
+                await asyncio.sleep(3 + attempt * 4)  # 3s, 7s backoff
+
+        return None, True  # Exhausted retries, definitely rate-limited
 
     def _fetch_transcript(self, video_id: str, original_lang: str) -> tuple:
-        """Fetch transcript using youtube-transcript-api with retry.
+        """Fetch transcript using youtube-transcript-api (single attempt).
 
         Language priority: English > original language > any available.
 
@@ -108,163 +255,215 @@ class YouTubeProcessor(ContentProcessor):
         Returns:
             Tuple of (transcript text or None, rate_limited bool)
         """
-        for attempt in range(3):
-            try:
-                transcripts = YouTubeTranscriptApi.list_transcripts(video_id)
-
-                # Build language priority list
-                priority_langs = ['en']
-                if original_lang and original_lang != 'en':
-                    priority_langs.append(original_lang)
-                    priority_langs.append(f'{original_lang}-orig')
-
-                # Try priority languages first, then fall back to any
-                transcript = None
-                for lang in priority_langs:
-                    try:
-                        transcript = transcripts.find_transcript([lang])
+        try:
+            transcripts = YouTubeTranscriptApi.list_transcripts(video_id)
+
+            # Build language priority list
+            priority_langs = ['en']
+            if original_lang and original_lang != 'en':
+                priority_langs.append(original_lang)
+                priority_langs.append(f'{original_lang}-orig')
+
+            # Try priority languages first, then fall back to any
+            transcript = None
+            for lang in priority_langs:
+                try:
+                    transcript = transcripts.find_transcript([lang])
+                    break
+                except Exception:
+                    continue
+
+            # If no priority language found, use the first available
+            if not transcript:
+                try:
+                    for t in transcripts:
+                        transcript = t
                         break
-                    except Exception:
-                        continue
-
-                # If no priority language found, use the first available
-                if not transcript:
-                    try:
-                        for t in transcripts:
-                            transcript = t
-                            break
-                    except Exception:
-                        pass
-
-                if not transcript:
-                    return None, False
-
-                segments = transcript.fetch()
-                return ' '.join([seg.text for seg in segments]), False
-
-            except Exception as e:
-                if '429' in str(e):
-                    if attempt < 2:
-                        time.sleep(3 + attempt * 4)  # 3s, 7s backoff
-                        continue
-                    return None, True  # Exhausted retries, definitely rate-limited
+                except Exception:
+                    pass
+
+            if not transcript:
                 return None, False
 
-        return None, True
+            segments = transcript.fetch()
+            text = ' '.join(seg.text for seg in segments)
+            return WHITESPACE_PATTERN.sub(' ', text).strip(), False
+
+        except Exception as e:
+            return None, '429' in str(e)
 
-    def _fetch_transcript_ytdlp(self, url: str, original_lang: str, info: Optional[dict]) -> Optional[str]:
-        """Fallback: fetch transcript via yt-dlp subtitle download.
+    def _subtitle_langs(self, original_lang: str, info: Optional[dict]) -> List[str]:
+        """Build subtitle language list to try: English, original, then any available.
 
         Args:
-            url: YouTube URL
             original_lang: Detected video language
             info: Previously extracted video info
 
         Returns:
-            Transcript text or None
+            Language codes in priority order
         """
-        try:
-            # Build language list to try
-            langs_to_try = ['en', original_lang] if original_lang != 'en' else ['en']
+        langs_to_try = ['en', original_lang] if original_lang != 'en' else ['en']
 
-            # Get available languages from info
-            if info:
-                subtitles = info.get('subtitles', {})
-                auto = info.get('automatic_captions', {})
-                available = list(subtitles.keys()) + list(auto.keys())
-            else:
-                available = []
-
-            # Add any available languages not already in the list
-            for lang in available:
-                if lang not in langs_to_try:
-                    langs_to_try.append(lang)
-
-            # Try each language
-            for lang in langs_to_try:
-                result = self._download_subtitle_ytdlp(url, lang)
+        # Get available languages from info
+        if info:
+            subtitles = info.get('subtitles', {})
+            auto = info.get('automatic_captions', {})
+            available = list(subtitles.keys()) + list(auto.keys())
+        else:
+            available = []
+
+        # Add any available languages not already in the list
+        for lang in available:
+            if lang not in langs_to_try:
+                langs_to_try.append(lang)
+
+        return langs_to_try
+
+    async def _fetch_transcript_direct(self, original_lang: str, info: Optional[dict]) -> Optional[str]:
+        """Fetch VTT captions straight from the track URLs listed in video info.
+
+        Avoids re-running yt-dlp and writing subtitle files to disk.
+
+        Args:
+            original_lang: Detected video language
+            info: Previously extracted video info
+
+        Returns:
+            Parsed subtitle text or None
+        """
+        if not info:
+            return None
+
+        subtitles = info.get('subtitles') or {}
+        auto = info.get('automatic_captions') or {}
+        session = await self.get_session()
+
+        for lang in self._subtitle_langs(original_lang, info):
+            tracks = subtitles.get(lang, []) + auto.get(lang, [])
+            for track in tracks:
+                if track.get('ext') != 'vtt' or not track.get('url'):
+                    continue
+                try:
+                    async with self.host_semaphore(track['url']), \
+                            session.get(track['url'], timeout=aiohttp.ClientTimeout(total=30)) as response:
+                        if response.status != 200:
+                            continue
+                        result = await self._parse_vtt_stream(response)
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                    # ValueError: oversized line in the body (UnicodeDecodeError
+                    # is a subclass); try the next track
+                    continue
                 if result:
                     return result
 
-            return None
-        except Exception:
-            return None
+        return None
 
-    def _download_subtitle_ytdlp(self, url: str, lang: str) -> Optional[str]:
-        """Download a single subtitle file via yt-dlp with retry.
+    async def _fetch_transcript_ytdlp(self, url: str, original_lang: str, info: Optional[dict]) -> Optional[str]:
+        """Last-resort fallback: fetch transcript via yt-dlp subtitle download.
+
+        Args:
+            url: YouTube URL
+            original_lang: Detected video language
+            info: Previously extracted video info
+
+        Returns:
+            Transcript text or None
+        """
+        # Try each language
+        for lang in self._subtitle_langs(original_lang, info):
+            result, _ = await self._run_with_backoff(self._download_subtitle_ytdlp, url, lang)
+            if result:
+                return result
+
+        return None
+
+    def _download_subtitle_ytdlp(self, url: str, lang: str) -> tuple:
+        """Download a single subtitle file via yt-dlp (single attempt).
 
         Args:
             url: YouTube URL
             lang: Language code
 
         Returns:
-            Parsed subtitle text or None
+            Tuple of (parsed subtitle text or None, rate_limited bool)
         """
         import tempfile
         import os
 
-        for attempt in range(3):
-            try:
-                with tempfile.TemporaryDirectory() as tmpdir:
-                    ydl_opts = {
-                        'writesubtitles': True,
-                        'writeautomaticsub': True,
-                        'subtitleslangs': [lang],
-                        'subtitlesformat': 'vtt',
-                        'skip_download': True,
-                        'outtmpl': os.path.join(tmpdir, '%(id)s'),
-                        'quiet': True,
-                        'no_warnings': True,
-                    }
-
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        ydl.download([url])
-
-                    # Find and read the subtitle file
-                    for filename in os.listdir(tmpdir):
-                        if filename.endswith('.vtt'):
-                            with open(os.path.join(tmpdir, filename), 'r', encoding='utf-8') as f:
-                                return self._parse_vtt(f.read())
-
-                    return None  # No file created
-
-            except Exception as e:
-                if '429' in str(e) and attempt < 2:
-                    time.sleep(3 + attempt * 4)
-                    continue
-                return None
+        try:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                ydl_opts = {
+                    'writesubtitles': True,
+                    'writeautomaticsub': True,
+                    'subtitleslangs': [lang],
+                    'subtitlesformat': 'vtt',
+                    'skip_download': True,
+                    'outtmpl': os.path.join(tmpdir, '%(id)s'),
+                    'quiet': True,
+                    'no_warnings': True,
+                }
+
+                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                    ydl.download([url])
+
+                # Find and read the subtitle file
+                for filename in os.listdir(tmpdir):
+                    if filename.endswith('.vtt'):
+                        with open(os.path.join(tmpdir, filename), 'r', encoding='utf-8') as f:
+                            return self._parse_vtt(f.read()), False
+
+                return None, False  # No file created
 
-        return None
+        except Exception as e:
+            return None, '429' in str(e)
 
     def _parse_vtt(self, content: str) -> Optional[str]:
-        """Parse VTT (WebVTT) subtitle format."""
+        """Parse VTT (WebVTT) subtitle format into whitespace-normalized text."""
+        return self._join_caption_lines(
+            match.group(1) for match in VTT_TEXT_PATTERN.finditer(content)
+        )
+
+    async def _parse_vtt_stream(self, response: aiohttp.ClientResponse) -> Optional[str]:
+        """Parse a VTT response line by line as it downloads.
+
+        Only the accepted caption lines are kept, never the whole body.
+
+        Args:
+            response: Open HTTP response with a VTT body
+
+        Returns:
+            Whitespace-normalized caption text or None
+        """
         lines = []
-        for line in content.split('\n'):
-            line = line.strip()
-            if (line and
-                not line.startswith('WEBVTT') and
-                '-->' not in line and
-                not line.startswith('NOTE') and
-                not line.startswith('STYLE') and
-                not line.startswith('::cue') and
-                not line.isdigit()):
-                line = re.sub(r'<[^>]+>', '', line)
-                if line:
-                    lines.append(line)
-
-        return ' '.join(lines) if lines else None
+        async for raw_line in response.content:
+            match = VTT_TEXT_PATTERN.match(raw_line.decode('utf-8', errors='replace'))
+            if match:
+                lines.append(match.group(1))
+        return self._join_caption_lines(lines)
+
+    @staticmethod
+    def _join_caption_lines(lines) -> Optional[str]:
+        """Strip tags from caption lines and join them into normalized text."""
+        text = '\n'.join(lines)
+        if '<' in text:
+            text = VTT_TAG_PATTERN.sub('', text)
+        text = WHITESPACE_PATTERN.sub(' ', text).strip()
+        return text or None
 
     async def get_document_name(self, url: str, content: str) -> str:
         """Generate short document name from video title."""
-        if self._last_video_info:
-            title = self._last_video_info.get('title', '')
+        video_id = self._extract_video_id(url)
+
+        # Metadata fetched by extract_content is cached per video ID
+        info = _info_cache.get(video_id)
+        if info:
+            title = info.get('title', '')
             if title:
                 return title[:57] + "..." if len(title) > 60 else title
 
         # Fallback: extract via yt-dlp
         try:
-            loop = asyncio.get_event_loop()
-            info = await loop.run_in_executor(None, lambda: self._get_video_info(url))
+            info = await self._run_blocking(self._get_video_info, url)
             if info:
                 title = info.get('title', '')
                 if title:
@@ -272,15 +471,39 @@ class YouTubeProcessor(ContentProcessor):
         except Exception:
             pass
 
-        video_id = self._extract_video_id(url)
         return f"YouTube Video {video_id}"
 
-    def get_video_duration(self) -> str:
-        """Get video duration in MM:SS format."""
-        if not self._last_video_info:
+    async def close(self) -> None:
+        """Shut down the YouTube worker thread pool and its YoutubeDL instances."""
+        global _executor
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+        while _info_ydls:
+            _info_ydls.pop().close()
+
+    def get_video_duration(self, url: Optional[str] = None) -> str:
+        """Get video duration in MM:SS format.
+
+        Args:
+            url: Video URL; looks up that video's cached metadata instead of
+                the most recently extracted one
+
+        Returns:
+            Duration string, or 'Unknown'
+        """
+        info = self._last_video_info
+        if url:
+            try:
+                info = _info_cache.get(self._extract_video_id(url), info)
+            except ValueError:
+                pass
+
+        if not info:
             return "Unknown"
 
-        duration_seconds = self._last_video_info.get('duration')
+        duration_seconds = info.get('duration')
         if not duration_seconds:
             return "Unknown"
 
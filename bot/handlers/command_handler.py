@@ -7,20 +7,7 @@ from bot.storage.base import BaseStorage
 from bot.utils.text_utils import format_document_list
 
 
-class CommandHandler:
-    """Handles bot commands."""
-
-    def __init__(self, storage: BaseStorage):
-        """Initialize command handler.
-
-        Args:
-            storage: Storage implementation
-        """
-        self.storage = storage
-
-    async def handle_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle /start command."""
-        welcome_message = """
+WELCOME_MESSAGE = """
 Welcome to the Summarizator Bot!
 
 I can help you:
@@ -40,11 +27,8 @@ How to use:
 
 Let's get started! Send me a link or ask a question.
 """
-        await update.message.reply_text(welcome_message)
 
-    async def handle_help(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle /help command."""
-        help_message = """
+HELP_MESSAGE = """
 Available commands:
 /start - Welcome message and introduction
 /help - Show this help message
@@ -65,7 +49,26 @@ Supported link types:
 - PDF documents
 - GitHub repositories (README files)
 """
-        await update.message.reply_text(help_message)
+
+
+class CommandHandler:
+    """Handles bot commands."""
+
+    def __init__(self, storage: BaseStorage):
+        """Initialize command handler.
+
+        Args:
+            storage: Storage implementation
+        """
+        self.storage = storage
+
+    async def handle_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /start command."""
+        await update.message.reply_text(WELCOME_MESSAGE)
+
+    async def handle_help(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /help command."""
+        await update.message.reply_text(HELP_MESSAGE)
 
     async def handle_list(
         self,
@@ -81,12 +84,11 @@ Supported link types:
             return
 
         # Format document list with numbered items
-        lines = ["Your document collection:\n"]
-        for i, doc in enumerate(documents, 1):
-            lines.append(f"{i}. [{doc.title}]({doc.url})")
-            lines.append(f"   Type: {doc.content_type} | Added: {doc.added_at.strftime('%Y-%m-%d %H:%M')}\n")
-
-        message = "\n".join(lines)
+        message = "Your document collection:\n\n" + "\n".join(
+            f"{i}. [{doc.title}]({doc.url})\n"
+            f"   Type: {doc.content_type} | Added: {doc.added_at:%Y-%m-%d %H:%M}\n"
+            for i, doc in enumerate(documents, 1)
+        )
         try:
             await update.message.reply_text(
                 message,
@@ -1,9 +1,9 @@
 """Link processing handler."""
-from datetime import datetime
+import asyncio
+from datetime import datetime, timezone
 from telegram import Update
 from telegram.ext import ContextTypes
 from telegram.error import BadRequest
-from openai import AsyncOpenAI
 
 from bot.rag.rag_manager import RAGManager
 from bot.storage.base import BaseStorage
@@ -15,7 +15,8 @@ from bot.content_processors.github_processor import GitHubProcessor
 from bot.prompts.manager import PromptManager
 from bot.utils.link_detector import LinkDetector
 from bot.utils.config import Config
-from bot.utils.text_utils import format_document_list
+from bot.utils.openai_client import get_openai_client
+from bot.utils.text_utils import format_document_list, load_encoding, CHARS_PER_TOKEN
 
 
 class LinkHandler:
@@ -37,14 +38,21 @@ class LinkHandler:
         self.storage = storage
         self.config = config
         self.prompt_manager = prompt_manager
-        self.openai_client = AsyncOpenAI(api_key=config.openai_api_key)
+        self.openai_client = get_openai_client(config.openai_api_key)
 
         # Initialize content processors
+        max_requests_per_host = config.max_requests_per_host
         self.processors = {
-            'web': WebProcessor(),
-            'youtube': YouTubeProcessor(),
-            'pdf': PDFProcessor(),
-            'github': GitHubProcessor()
+            'web': WebProcessor(max_requests_per_host),
+            'youtube': YouTubeProcessor(max_requests_per_host),
+            'pdf': PDFProcessor(max_requests_per_host),
+            'github': GitHubProcessor(max_requests_per_host)
+        }
+
+        # Resolve summarization prompts once, one per content type
+        self._summary_prompts = {
+            content_type: prompt_manager.get_summarization_prompt(content_type)
+            for content_type in self.processors
         }
 
     async def handle(
@@ -62,7 +70,7 @@ class LinkHandler:
             url: Extracted URL
             rag_manager: RAG manager for user
         """
-        user_id = str(update.effective_user.id)
+        user_id = rag_manager.user_id
         message_id = str(update.message.message_id)
 
         # Send processing status
@@ -79,35 +87,26 @@ class LinkHandler:
             await status_msg.edit_text(f"Extracting content from {content_type} link...")
             content = await processor.extract_content(url)
 
-            # 4. Get document name
-            doc_name = await processor.get_document_name(url, content)
-
-            # 5. Generate summary
+            # 4-5. Get document name and generate summary (independent, run concurrently)
             await status_msg.edit_text("Generating summary...")
-            summary = await self._generate_summary(content, content_type, processor)
+            doc_name, summary = await asyncio.gather(
+                processor.get_document_name(url, content),
+                self._generate_summary(content, content_type, processor, url)
+            )
 
-            # 6. Send summary to user
+            # 6-7. Send summary to user while adding the document to RAG
             await status_msg.delete()
-            summary_text = f"**Summary of {doc_name}:**\n\n{summary}"
-            try:
-                summary_msg = await update.message.reply_text(
-                    summary_text,
-                    parse_mode='Markdown'
+            summary_msg, document = await asyncio.gather(
+                self._send_summary(update, doc_name, summary),
+                rag_manager.add_document(
+                    url=url,
+                    content=content,
+                    title=doc_name,
+                    content_type=content_type
                 )
-            except BadRequest:
-                # Fallback to plain text if markdown fails
-                summary_msg = await update.message.reply_text(summary_text)
-
-            # 7. Add document to RAG
-            await update.message.reply_text("Adding to your knowledge base...")
-            document = await rag_manager.add_document(
-                url=url,
-                content=content,
-                title=doc_name,
-                content_type=content_type
             )
 
-            # 8. Get and send document list
+            # 8. Send document list (kept up to date by add_document, no storage read)
             documents = await rag_manager.get_document_list()
             doc_list_text = format_document_list(documents)
             try:
@@ -121,26 +120,22 @@ class LinkHandler:
                 await update.message.reply_text(doc_list_text)
 
             # 9. Save messages to storage
-            # Save user message
             user_message = Message(
                 message_id=message_id,
                 user_id=user_id,
-                timestamp=datetime.fromtimestamp(update.message.date.timestamp()),
+                timestamp=update.message.date,
                 content=update.message.text,
                 is_bot=False
             )
-            await self.storage.save_message(user_id, user_message)
-
-            # Save bot summary message
             bot_message = Message(
                 message_id=str(summary_msg.message_id),
                 user_id=user_id,
-                timestamp=datetime.now(),
+                timestamp=datetime.now(timezone.utc),
                 content=f"Summary of {doc_name}: {summary}",
                 is_bot=True,
                 metadata={'doc_id': document.doc_id, 'url': url}
             )
-            await self.storage.save_message(user_id, bot_message)
+            await self.storage.save_messages(user_id, [user_message, bot_message])
 
         except Exception as e:
             # Error handling - don't add to RAG if extraction fails
@@ -152,38 +147,83 @@ class LinkHandler:
             user_message = Message(
                 message_id=message_id,
                 user_id=user_id,
-                timestamp=datetime.fromtimestamp(update.message.date.timestamp()),
+                timestamp=update.message.date,
                 content=update.message.text,
                 is_bot=False
             )
             await self.storage.save_message(user_id, user_message)
 
-    async def _generate_summary(self, content: str, content_type: str, processor) -> str:
+    async def _send_summary(self, update: Update, doc_name: str, summary: str):
+        """Send summary to user, followed by the knowledge base status.
+
+        Args:
+            update: Telegram update
+            doc_name: Document name
+            summary: Generated summary
+
+        Returns:
+            Sent summary message
+        """
+        summary_text = f"**Summary of {doc_name}:**\n\n{summary}"
+        try:
+            summary_msg = await update.message.reply_text(
+                summary_text,
+                parse_mode='Markdown'
+            )
+        except BadRequest:
+            # Fallback to plain text if markdown fails
+            summary_msg = await update.message.reply_text(summary_text)
+
+        await update.message.reply_text("Adding to your knowledge base...")
+        return summary_msg
+
+    def _truncate_content(self, content: str) -> str:
+        """Truncate content to the configured token budget for summarization.
+
+        Tokenizing long content is slow, so this is run in a worker thread.
+
+        Args:
+            content: Content to truncate
+
+        Returns:
+            Content, truncated with a marker if it exceeds the budget
+        """
+        max_tokens = self.config.max_summary_input_tokens
+        encoding = load_encoding(self.config.openai_model)
+
+        if encoding is None:
+            max_content_length = max_tokens * CHARS_PER_TOKEN
+            if len(content) > max_content_length:
+                return content[:max_content_length] + "\n\n[Content truncated...]"
+            return content
+
+        tokens = encoding.encode(content, disallowed_special=())
+        if len(tokens) > max_tokens:
+            return encoding.decode(tokens[:max_tokens]) + "\n\n[Content truncated...]"
+        return content
+
+    async def _generate_summary(self, content: str, content_type: str, processor, url: str) -> str:
         """Generate summary using OpenAI.
 
         Args:
             content: Content to summarize
             content_type: Type of content
             processor: Content processor instance
+            url: Source URL
 
         Returns:
             Generated summary
         """
         # Get prompt template
-        prompt_template = self.prompt_manager.get_summarization_prompt(content_type)
+        prompt_template = self._summary_prompts[content_type]
 
         # Fill in template (truncate content if too long)
-        max_content_length = 15000  # Reasonable limit for GPT-4
-        if len(content) > max_content_length:
-            content = content[:max_content_length] + "\n\n[Content truncated...]"
+        content = await asyncio.to_thread(self._truncate_content, content)
 
         # Format prompt based on content type
         if content_type == "youtube":
-            # For YouTube videos, get duration
-            duration = "Unknown"
-            from bot.content_processors.youtube_processor import YouTubeProcessor
-            if isinstance(processor, YouTubeProcessor):
-                duration = processor.get_video_duration()
+            # For YouTube videos, get duration (the processor is a YouTubeProcessor)
+            duration = processor.get_video_duration(url)
             prompt = prompt_template.format(content=content, duration=duration)
         else:
             # For other content types, only use content
@@ -1,4 +1,5 @@
 """Message routing handler."""
+from collections import OrderedDict
 from telegram import Update
 from telegram.ext import ContextTypes
 
@@ -34,28 +35,39 @@ class MessageRouter:
         # Initialize handlers
         self.link_handler = LinkHandler(storage, config, prompt_manager)
         self.question_handler = QuestionHandler(storage, config)
-        self.link_detector = LinkDetector()
 
-        # Cache RAG managers per user
-        self._rag_managers = {}
+        # Cache RAG managers per user, evicting the least recently used
+        self._rag_managers: OrderedDict = OrderedDict()
+        self._max_rag_managers = config.rag_manager_cache_size
 
-    def _get_rag_manager(self, user_id: str) -> RAGManager:
+    def _get_rag_manager(self, user_id: int) -> RAGManager:
         """Get or create RAG manager for user.
 
         Args:
-            user_id: User's unique identifier
+            user_id: Telegram user ID (the storage layer receives it as a string)
 
         Returns:
             RAG manager instance
         """
-        if user_id not in self._rag_managers:
-            self._rag_managers[user_id] = RAGManager(
-                user_id=user_id,
-                storage=self.storage,
-                config=self.config,
-                prompt_manager=self.prompt_manager
-            )
-        return self._rag_managers[user_id]
+        rag_manager = self._rag_managers.get(user_id)
+        if rag_manager is not None:
+            self._rag_managers.move_to_end(user_id)
+            return rag_manager
+
+        rag_manager = RAGManager(
+            user_id=str(user_id),
+            storage=self.storage,
+            config=self.config,
+            prompt_manager=self.prompt_manager
+        )
+        self._rag_managers[user_id] = rag_manager
+
+        # Evicted managers are only dropped, not closed, since a request
+        # that already holds one may still be using it
+        while len(self._rag_managers) > self._max_rag_managers:
+            self._rag_managers.popitem(last=False)
+
+        return rag_manager
 
     async def route_message(
         self,
@@ -72,14 +84,13 @@ class MessageRouter:
             return
 
         message_text = update.message.text
-        user_id = str(update.effective_user.id)
 
         # Get RAG manager for user
-        rag_manager = self._get_rag_manager(user_id)
+        rag_manager = self._get_rag_manager(update.effective_user.id)
 
         try:
             # Check if message contains a URL
-            url = self.link_detector.extract_url(message_text)
+            url = LinkDetector.extract_url(message_text)
 
             if url:
                 # Handle as link
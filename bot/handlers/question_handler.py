@@ -1,5 +1,5 @@
 """Question/RAG query handler."""
-from datetime import datetime
+from datetime import datetime, timezone
 from telegram import Update
 from telegram.ext import ContextTypes
 
@@ -37,7 +37,7 @@ class QuestionHandler:
             question: User's question
             rag_manager: RAG manager for user
         """
-        user_id = str(update.effective_user.id)
+        user_id = rag_manager.user_id
         message_id = str(update.message.message_id)
 
         # Send thinking status
@@ -62,25 +62,21 @@ class QuestionHandler:
             answer_msg = await update.message.reply_text(answer)
 
             # 4. Save messages
-            # Save user question
             user_message = Message(
                 message_id=message_id,
                 user_id=user_id,
-                timestamp=datetime.fromtimestamp(update.message.date.timestamp()),
+                timestamp=update.message.date,
                 content=question,
                 is_bot=False
             )
-            await self.storage.save_message(user_id, user_message)
-
-            # Save bot answer
             bot_message = Message(
                 message_id=str(answer_msg.message_id),
                 user_id=user_id,
-                timestamp=datetime.now(),
+                timestamp=datetime.now(timezone.utc),
                 content=answer,
                 is_bot=True
             )
-            await self.storage.save_message(user_id, bot_message)
+            await self.storage.save_messages(user_id, [user_message, bot_message])
 
         except Exception as e:
             await status_msg.delete()
@@ -91,7 +87,7 @@ class QuestionHandler:
             user_message = Message(
                 message_id=message_id,
                 user_id=user_id,
-                timestamp=datetime.fromtimestamp(update.message.date.timestamp()),
+                timestamp=update.message.date,
                 content=question,
                 is_bot=False
             )
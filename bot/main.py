@@ -8,6 +8,8 @@ from bot.storage.file_storage import FileStorage
 from bot.prompts.manager import PromptManager
 from bot.handlers.message_handler import MessageRouter
 from bot.handlers.command_handler import CommandHandler
+from bot.content_processors.base import ContentProcessor
+from bot.utils.openai_client import close_openai_clients
 
 
 # Configure logging
@@ -41,7 +43,12 @@ class SummarizatorBot:
     def start(self):
         """Build and start the bot application."""
         # Build application
-        self.app = Application.builder().token(self.config.telegram_token).build()
+        self.app = (
+            Application.builder()
+            .token(self.config.telegram_token)
+            .post_shutdown(self._on_shutdown)
+            .build()
+        )
 
         # Register command handlers
         self.app.add_handler(
@@ -75,22 +82,27 @@ class SummarizatorBot:
         logger.info("Starting bot...")
         self.app.run_polling(allowed_updates=Update.ALL_TYPES)
 
+    async def _on_shutdown(self, app: Application):
+        """Release shared resources when the application stops."""
+        await self.storage.flush_all()
+        for processor in self.message_router.link_handler.processors.values():
+            await processor.close()
+        await ContentProcessor.close_session()
+        await close_openai_clients()
+
     async def _handle_list_command(self, update: Update, context):
         """Wrapper for list command that provides RAG manager."""
-        user_id = str(update.effective_user.id)
-        rag_manager = self.message_router._get_rag_manager(user_id)
+        rag_manager = self.message_router._get_rag_manager(update.effective_user.id)
         await self.command_handler.handle_list(update, context, rag_manager)
 
     async def _handle_delete_command(self, update: Update, context):
         """Wrapper for delete command that provides RAG manager."""
-        user_id = str(update.effective_user.id)
-        rag_manager = self.message_router._get_rag_manager(user_id)
+        rag_manager = self.message_router._get_rag_manager(update.effective_user.id)
         await self.command_handler.handle_delete(update, context, rag_manager)
 
     async def _handle_clear_command(self, update: Update, context):
         """Wrapper for clear command that provides RAG manager."""
-        user_id = str(update.effective_user.id)
-        rag_manager = self.message_router._get_rag_manager(user_id)
+        rag_manager = self.message_router._get_rag_manager(update.effective_user.id)
         await self.command_handler.handle_clear(update, context, rag_manager)
 
 
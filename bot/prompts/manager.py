@@ -1,6 +1,7 @@
 """Prompt template manager."""
 from pathlib import Path
-from typing import Dict
+from types import MappingProxyType
+from typing import Mapping
 
 
 class PromptManager:
@@ -13,7 +14,13 @@ class PromptManager:
             prompts_dir: Directory containing prompt templates
         """
         self.prompts_dir = Path(prompts_dir)
-        self._cache: Dict[str, str] = {}
+
+        # Read every template up front, so lookups never touch the disk and
+        # the read-only mapping can be shared between concurrent handlers
+        self._cache: Mapping[str, str] = MappingProxyType({
+            path.relative_to(self.prompts_dir).as_posix(): path.read_text()
+            for path in self.prompts_dir.rglob('*.txt')
+        })
 
     def get_summarization_prompt(self, content_type: str) -> str:
         """Get summarization prompt for content type.
@@ -35,7 +42,7 @@ class PromptManager:
         return self._load_prompt("rag/answer.txt")
 
     def _load_prompt(self, path: str) -> str:
-        """Load and cache prompt template.
+        """Get a preloaded prompt template.
 
         Args:
             path: Relative path to prompt file
@@ -46,11 +53,7 @@ class PromptManager:
         Raises:
             FileNotFoundError: If prompt template not found
         """
-        if path not in self._cache:
-            full_path = self.prompts_dir / path
-            if not full_path.exists():
-                raise FileNotFoundError(f"Prompt template not found: {full_path}")
-
-            self._cache[path] = full_path.read_text()
-
-        return self._cache[path]
+        try:
+            return self._cache[path]
+        except KeyError:
+            raise FileNotFoundError(f"Prompt template not found: {self.prompts_dir / path}") from None
@@ -1,89 +1,164 @@
 """Per-user Chroma DB embedding storage."""
+import asyncio
+import hashlib
+from functools import lru_cache
 import chromadb
 from chromadb.config import Settings
-from typing import List, Dict, Any
+from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+from typing import Callable, List, Dict, Any, Optional
+from bot.utils.cache import TTLCache
+
+
+# Embedding function shared by all collections (Chroma's default model),
+# called directly for queries so their embeddings can be cached
+EMBEDDING_FUNCTION = DefaultEmbeddingFunction()
+
+# Embeddings of recent questions, shared across users, keyed by a hash of
+# the question so long questions aren't kept in memory
+_query_embeddings = TTLCache(maxsize=4096, ttl=None)
+
+# Number of IDs deleted per call when clearing a collection
+DELETE_BATCH_SIZE = 1000
+
+
+@lru_cache(maxsize=256)
+def _get_client(db_path: str) -> chromadb.ClientAPI:
+    """Get the Chroma client for a database directory, creating it once.
+
+    Args:
+        db_path: Path to a user's Chroma DB directory
+
+    Returns:
+        Persistent Chroma client shared by all stores for that path
+    """
+    return chromadb.PersistentClient(
+        path=db_path,
+        settings=Settings(anonymized_telemetry=False)
+    )
 
 
 class EmbeddingStore:
     """Manages per-user Chroma DB instances."""
 
-    def __init__(self, db_path: str):
+    def __init__(
+        self,
+        db_path: str,
+        hnsw_m: int = 16,
+        hnsw_construction_ef: int = 100,
+        hnsw_search_ef: int = 64
+    ):
         """Initialize embedding store for a user.
 
         Args:
             db_path: Path to user's Chroma DB directory
+            hnsw_m: HNSW graph links per node (new collections only)
+            hnsw_construction_ef: HNSW build-time candidate list size (new collections only)
+            hnsw_search_ef: HNSW query-time candidate list size; the main
+                recall/latency knob, also applied to existing collections
         """
         self.db_path = db_path
-        self.client = chromadb.PersistentClient(
-            path=db_path,
-            settings=Settings(anonymized_telemetry=False)
-        )
+        self.client = _get_client(db_path)
+
+        # Chroma's local index only stores float32 vectors. While a user has
+        # fewer chunks than search_ef, HNSW search is already exhaustive.
+        self.collection_metadata = {
+            "hnsw:space": "cosine",
+            "hnsw:M": hnsw_m,
+            "hnsw:construction_ef": hnsw_construction_ef,
+            "hnsw:search_ef": hnsw_search_ef,
+        }
         self.collection = self.client.get_or_create_collection(
             name="documents",
-            metadata={"hnsw:space": "cosine"}
+            metadata=self.collection_metadata,
+            embedding_function=EMBEDDING_FUNCTION
         )
 
+        # Collections created with other settings keep their graph parameters,
+        # but search_ef can be changed in place
+        if self.collection.configuration_json['hnsw']['ef_search'] != hnsw_search_ef:
+            self.collection.modify(configuration={"hnsw": {"ef_search": hnsw_search_ef}})
+
     async def add_document(
         self,
         doc_id: str,
         content: str,
-        metadata: Dict[str, Any]
+        metadata: Dict[str, Any],
+        chunker: Callable[[str], List[str]]
     ) -> None:
-        """Add document to embedding store.
+        """Add document to embedding store, replacing any previous version.
+
+        Each chunk is stored as its own entry with ID '{doc_id}:{index}'
+        and 'doc_id' / 'chunk_index' added to its metadata.
 
         Args:
             doc_id: Unique document identifier
-            content: Document content to embed
+            content: Document content
             metadata: Document metadata
+            chunker: Splits the content into chunks to embed; called in a
+                worker thread, as tokenizing is blocking
         """
-        # Check if document already exists
-        existing = self.collection.get(ids=[doc_id])
-        if existing and existing['ids']:
-            # Update existing document
-            self.collection.update(
-                ids=[doc_id],
-                documents=[content],
-                metadatas=[metadata]
-            )
-        else:
-            # Add new document
-            self.collection.add(
-                ids=[doc_id],
-                documents=[content],
-                metadatas=[metadata]
-            )
+        # Chunking, embedding and index insertion are blocking, so they run
+        # off the event loop
+        await asyncio.to_thread(self._add_document, doc_id, content, metadata, chunker)
+
+    def _add_document(
+        self,
+        doc_id: str,
+        content: str,
+        metadata: Dict[str, Any],
+        chunker: Callable[[str], List[str]]
+    ) -> None:
+        """Chunk a document and replace its entries (blocking)."""
+        chunks = chunker(content)
+        ids = [f"{doc_id}:{i}" for i in range(len(chunks))]
+        metadatas = [
+            {**metadata, 'doc_id': doc_id, 'chunk_index': i}
+            for i in range(len(chunks))
+        ]
+        self._replace_document(doc_id, ids, chunks, metadatas)
 
     async def query(
         self,
         query_text: str,
-        n_results: int = 3
+        n_results: int = 3,
+        max_content_length: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """Query embedding store for relevant documents.
 
         Args:
             query_text: Query text
             n_results: Number of results to return
+            max_content_length: If set, content is cut to this many characters
 
         Returns:
-            List of relevant documents with metadata
+            List of relevant documents with metadata, holding the best
+            matching chunk of each document
         """
-        results = self.collection.query(
-            query_texts=[query_text],
-            n_results=min(n_results, self.collection.count())
-        )
+        # Fetch extra chunks, since several may come from the same document
+        results = await asyncio.to_thread(self._query, query_text, n_results * 2)
 
         if not results['documents'] or not results['documents'][0]:
             return []
 
-        # Format results
+        # Format results, keeping the closest chunk per document
         documents = []
+        seen = set()
         for i in range(len(results['ids'][0])):
+            metadata = results['metadatas'][0][i] if results['metadatas'] else {}
+            doc_id = metadata.get('doc_id', results['ids'][0][i])
+            if doc_id in seen:
+                continue
+            seen.add(doc_id)
+
+            content = results['documents'][0][i]
             documents.append({
-                'id': results['ids'][0][i],
-                'content': results['documents'][0][i],
-                'metadata': results['metadatas'][0][i] if results['metadatas'] else {},
+                'id': doc_id,
+                'content': content[:max_content_length] if max_content_length else content,
+                'metadata': metadata,
                 'distance': results['distances'][0][i] if results.get('distances') else None
             })
+            if len(documents) == n_results:
+                break
 
         return documents
 
@@ -97,24 +172,76 @@ class EmbeddingStore:
             True if deleted, False if not found
         """
         try:
-            self.collection.delete(ids=[doc_id])
+            await asyncio.to_thread(self._delete_chunks, doc_id)
             return True
-        except:
+        except Exception:
             return False
 
     async def clear_all(self) -> int:
         """Clear all documents from embedding store.
 
         Returns:
-            Number of documents deleted
+            Number of entries (document chunks) deleted
         """
-        count = self.collection.count()
-        self.client.delete_collection(name="documents")
-        self.collection = self.client.get_or_create_collection(
-            name="documents",
-            metadata={"hnsw:space": "cosine"}
+        return await asyncio.to_thread(self._delete_all)
+
+    def _replace_document(
+        self,
+        doc_id: str,
+        ids: List[str],
+        chunks: List[str],
+        metadatas: List[Dict[str, Any]]
+    ) -> None:
+        """Replace a document's chunks with new ones (blocking).
+
+        The new chunks are embedded before anything is written, and old
+        chunks are only removed once the new ones are stored, so a failure
+        leaves the previous version searchable.
+        """
+        embeddings = EMBEDDING_FUNCTION(chunks)
+        self.collection.upsert(ids=ids, embeddings=embeddings, documents=chunks, metadatas=metadatas)
+
+        # Drop chunks of the previous version beyond the new chunk count, and
+        # any entry stored under the bare doc_id from before chunking
+        self.collection.delete(ids=[doc_id])
+        self.collection.delete(where={'$and': [
+            {'doc_id': doc_id},
+            {'chunk_index': {'$gte': len(chunks)}}
+        ]})
+
+    def _delete_chunks(self, doc_id: str) -> None:
+        """Delete all entries of a document (blocking)."""
+        # Documents added before chunking are stored under the bare doc_id
+        self.collection.delete(ids=[doc_id])
+        self.collection.delete(where={'doc_id': doc_id})
+
+    def _query(self, query_text: str, n_results: int) -> Dict[str, Any]:
+        """Run a blocking Chroma query."""
+        return self.collection.query(
+            query_embeddings=[self._embed_query(query_text)],
+            n_results=min(n_results, self.collection.count()),
+            include=["documents", "metadatas", "distances"]
         )
-        return count
+
+    def _embed_query(self, query_text: str):
+        """Embed query text, reusing the cached embedding for repeated queries (blocking)."""
+        key = hashlib.blake2b(query_text.encode(), digest_size=16).digest()
+        embedding = _query_embeddings.get(key)
+        if embedding is None:
+            embedding = EMBEDDING_FUNCTION([query_text])[0]
+            _query_embeddings.set(key, embedding)
+        return embedding
+
+    def _delete_all(self) -> int:
+        """Delete every entry in place, in batches, returning how many there were.
+
+        Keeps the collection (and its index settings) instead of dropping
+        and recreating it.
+        """
+        ids = self.collection.get(include=[])['ids']
+        for start in range(0, len(ids), DELETE_BATCH_SIZE):
+            self.collection.delete(ids=ids[start:start + DELETE_BATCH_SIZE])
+        return len(ids)
 
     def get_document_count(self) -> int:
         """Get number of documents in store.
@@ -1,13 +1,28 @@
 """RAG operations manager."""
-from typing import List, Dict, Any
+import asyncio
+from typing import List, Dict, Any, Optional
 from datetime import datetime
 import hashlib
-from openai import AsyncOpenAI
 from bot.rag.embedding_store import EmbeddingStore
 from bot.storage.base import BaseStorage
 from bot.storage.models import Document, Message
 from bot.prompts.manager import PromptManager
 from bot.utils.config import Config
+from bot.utils.openai_client import get_openai_client
+from bot.utils.text_utils import chunk_text, load_encoding
+
+
+# Chunk size for embedding, in tokens. Chroma's default embedding model
+# only reads the first 256 tokens of its input, so longer chunks would be
+# cut off; consecutive chunks overlap so passages aren't split blindly.
+CHUNK_TOKENS = 256
+CHUNK_OVERLAP_TOKENS = 32
+
+# Characters of each retrieved chunk included in the answer prompt
+RETRIEVED_CONTENT_LENGTH = 500
+
+# Conversation histories longer than this are formatted in a worker thread
+HISTORY_OFFLOAD_THRESHOLD = 100
 
 
 class RAGManager:
@@ -33,12 +48,21 @@ class RAGManager:
         self.config = config
         self.prompt_manager = prompt_manager
 
-        # Initialize OpenAI client
-        self.openai_client = AsyncOpenAI(api_key=config.openai_api_key)
+        # Shared OpenAI client
+        self.openai_client = get_openai_client(config.openai_api_key)
 
         # Initialize embedding store
         db_path = storage.get_user_db_path(user_id)
-        self.embedding_store = EmbeddingStore(db_path)
+        self.embedding_store = EmbeddingStore(
+            db_path,
+            hnsw_m=config.hnsw_m,
+            hnsw_construction_ef=config.hnsw_construction_ef,
+            hnsw_search_ef=config.hnsw_search_ef
+        )
+
+        # Document list, loaded from storage on first use and then kept in
+        # sync by add_document / delete_document / clear_all_documents
+        self._documents: Optional[List[Document]] = None
 
     async def add_document(
         self,
@@ -58,8 +82,9 @@ class RAGManager:
         Returns:
             Created Document object
         """
-        # Generate document ID from URL
-        doc_id = hashlib.md5(url.encode()).hexdigest()
+        # Generate document ID from URL. MD5 is kept so IDs of already saved
+        # documents stay the same; it's only used as a fingerprint
+        doc_id = hashlib.md5(url.encode(), usedforsecurity=False).hexdigest()
 
         # Create document metadata
         content_preview = content[:self.config.max_document_preview_length]
@@ -72,20 +97,36 @@ class RAGManager:
             content_preview=content_preview
         )
 
-        # Save to storage
+        # Version being replaced, if any, to restore if adding fails
+        previous = await self.storage.get_document(self.user_id, doc_id)
+
+        # Save to storage first, so a failed save leaves the embeddings untouched
         await self.storage.save_document(self.user_id, document)
 
-        # Add to embedding store
-        await self.embedding_store.add_document(
-            doc_id=doc_id,
-            content=content,
-            metadata={
-                'url': url,
-                'title': title,
-                'content_type': content_type,
-                'added_at': document.added_at.isoformat()
-            }
-        )
+        # Add to embedding store (split into chunks). The store keeps the
+        # previous version's chunks if this fails, so only storage is restored.
+        try:
+            await self.embedding_store.add_document(
+                doc_id=doc_id,
+                content=content,
+                metadata={
+                    'url': url,
+                    'title': title,
+                    'content_type': content_type,
+                    'added_at': document.added_at.isoformat()
+                },
+                chunker=self._chunk_content
+            )
+        except Exception:
+            # Don't list a document that can't be retrieved
+            if previous is not None:
+                await self.storage.save_document(self.user_id, previous)
+            else:
+                await self.storage.delete_document(self.user_id, doc_id)
+            raise
+
+        if self._documents is not None:
+            self._replace_or_append(self._documents, document)
 
         return document
 
@@ -105,18 +146,29 @@ class RAGManager:
         Returns:
             Generated answer
         """
-        # Query embedding store for relevant documents
-        relevant_docs = await self.embedding_store.query(question, n_results=n_results)
-
-        # Format conversation history
-        history_text = self._format_conversation_history(conversation_history)
+        # Query embedding store for relevant documents in the background,
+        # overlapping the retrieval with the prompt preparation below
+        relevant_docs_task = asyncio.create_task(self.embedding_store.query(
+            question,
+            n_results=n_results,
+            max_content_length=RETRIEVED_CONTENT_LENGTH
+        ))
+        # Yield once so the task starts and hands the lookup to its thread
+        await asyncio.sleep(0)
+
+        # Get RAG prompt template and format conversation history
+        prompt_template = self.prompt_manager.get_rag_prompt()
+        if len(conversation_history) > HISTORY_OFFLOAD_THRESHOLD:
+            history_text = await asyncio.to_thread(
+                self._format_conversation_history, conversation_history
+            )
+        else:
+            history_text = self._format_conversation_history(conversation_history)
 
         # Format retrieved documents
+        relevant_docs = await relevant_docs_task
         docs_text = self._format_retrieved_documents(relevant_docs)
 
-        # Get RAG prompt template
-        prompt_template = self.prompt_manager.get_rag_prompt()
-
         # Fill in template
         prompt = prompt_template.format(
             conversation_history=history_text,
@@ -142,7 +194,9 @@ class RAGManager:
         Returns:
             List of Document objects
         """
-        return await self.storage.get_documents(self.user_id)
+        if self._documents is None:
+            self._documents = await self.storage.get_documents(self.user_id)
+        return list(self._documents)
 
     async def delete_document(self, doc_id: str) -> bool:
         """Delete document from RAG.
@@ -153,11 +207,13 @@ class RAGManager:
         Returns:
             True if deleted, False if not found
         """
-        # Delete from embedding store
-        embedding_deleted = await self.embedding_store.delete_document(doc_id)
-
-        # Delete from storage
-        storage_deleted = await self.storage.delete_document(self.user_id, doc_id)
+        # Delete from embedding store and storage concurrently
+        embedding_deleted, storage_deleted = await asyncio.gather(
+            self.embedding_store.delete_document(doc_id),
+            self.storage.delete_document(self.user_id, doc_id)
+        )
+        if self._documents is not None:
+            self._documents = [doc for doc in self._documents if doc.doc_id != doc_id]
 
         return embedding_deleted or storage_deleted
 
@@ -167,14 +223,41 @@ class RAGManager:
         Returns:
             Number of documents deleted
         """
-        # Clear from embedding store
-        await self.embedding_store.clear_all()
-
-        # Clear from storage
-        count = await self.storage.clear_documents(self.user_id)
+        # Clear from embedding store and storage concurrently
+        _, count = await asyncio.gather(
+            self.embedding_store.clear_all(),
+            self.storage.clear_documents(self.user_id)
+        )
+        self._documents = []
 
         return count
 
+    def _chunk_content(self, content: str) -> List[str]:
+        """Split content into overlapping chunks for embedding (blocking).
+
+        Args:
+            content: Document content
+
+        Returns:
+            List of chunks
+        """
+        encoding = load_encoding(self.config.openai_model)
+        return chunk_text(content, encoding, CHUNK_TOKENS, CHUNK_OVERLAP_TOKENS)
+
+    @staticmethod
+    def _replace_or_append(documents: List[Document], document: Document) -> None:
+        """Update a document in the list in place, or append it if new.
+
+        Args:
+            documents: List of Document objects
+            document: Document to store
+        """
+        for idx, doc in enumerate(documents):
+            if doc.doc_id == document.doc_id:
+                documents[idx] = document
+                return
+        documents.append(document)
+
     def _format_conversation_history(self, messages: List[Message]) -> str:
         """Format conversation history for prompt.
 
@@ -206,16 +289,15 @@ class RAGManager:
         if not documents:
             return "No relevant documents found."
 
-        lines = []
+        # One string per document; content is normally already cut by the
+        # embedding store, and slicing a short string doesn't copy it
+        entries = []
         for i, doc in enumerate(documents, 1):
             metadata = doc.get('metadata', {})
-            title = metadata.get('title', 'Untitled')
-            url = metadata.get('url', '')
-            content = doc.get('content', '')
-
-            lines.append(f"Document {i}: {title}")
-            lines.append(f"URL: {url}")
-            lines.append(f"Content: {content[:500]}...")  # Truncate to 500 chars
-            lines.append("")
+            entries.append(
+                f"Document {i}: {metadata.get('title', 'Untitled')}\n"
+                f"URL: {metadata.get('url', '')}\n"
+                f"Content: {doc.get('content', '')[:RETRIEVED_CONTENT_LENGTH]}...\n"
+            )
 
-        return "\n".join(lines)
+        return "\n".join(entries)
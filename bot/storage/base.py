@@ -77,6 +77,25 @@ class BaseStorage(ABC):
         """
         pass
 
+    async def save_messages(self, user_id: str, messages: List[Message]) -> None:
+        """Save several conversation messages at once, in order.
+
+        Implementations should override this with a single bulk write.
+
+        Args:
+            user_id: User's unique identifier
+            messages: Message objects to save
+        """
+        for message in messages:
+            await self.save_message(user_id, message)
+
+    async def flush_all(self) -> None:
+        """Write out any buffered data before shutdown.
+
+        Implementations that buffer writes should override this.
+        """
+        pass
+
     @abstractmethod
     async def get_messages(self, user_id: str, limit: Optional[int] = None) -> List[Message]:
         """Retrieve recent conversation history.
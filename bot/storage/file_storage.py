@@ -1,13 +1,72 @@
 """File-based storage implementation."""
-import json
+import asyncio
+import logging
+import mmap
 import os
+from collections import deque
 from pathlib import Path
-from typing import List, Optional
+from typing import Deque, Dict, List, Optional, Tuple
 import aiofiles
+import orjson
 from bot.storage.base import BaseStorage
 from bot.storage.models import Document, Message
 
 
+logger = logging.getLogger(__name__)
+
+# documents.jsonl holds one document per line. Updates append the new
+# version and deletions append a tombstone, so the file is compacted once
+# stale lines make up more than this fraction of it.
+COMPACT_RATIO = 0.2
+
+# Number of most recent messages kept in memory per user
+MESSAGE_CACHE_SIZE = 200
+
+# Block size for reading messages.jsonl backwards from the end
+TAIL_CHUNK_SIZE = 64 * 1024
+
+# documents.jsonl files larger than this are memory-mapped rather than read
+MMAP_THRESHOLD = 64 * 1024
+
+# Seconds saved messages are buffered, so a burst is appended in one write
+MESSAGE_FLUSH_DELAY = 0.05
+
+
+def _dir_size(path: Path) -> int:
+    """Sum the sizes of all files under a directory, without following symlinks."""
+    total = 0
+    stack = [path]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    total += entry.stat(follow_symlinks=False).st_size
+    return total
+
+
+def _append_and_sync(path: Path, data: bytes) -> None:
+    """Append bytes to a file and fsync it (blocking)."""
+    with open(path, 'ab') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _read_documents_mmap(path: Path, locations: List[Tuple[int, int]]) -> List[Document]:
+    """Parse documents at the given (offset, length) locations of a memory-mapped file.
+
+    Only the current document lines are copied out of the page cache,
+    never the whole file.
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return [
+            Document.from_dict(orjson.loads(mm[offset:offset + length]))
+            for offset, length in locations
+        ]
+
+
 class FileStorage(BaseStorage):
     """File-based storage implementation."""
 
@@ -20,6 +79,33 @@ class FileStorage(BaseStorage):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
 
+        # Per-user index of documents.jsonl: doc_id -> (offset, length) of the
+        # document's current line, in list order (built lazily)
+        self._doc_index: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        # Per-user count of lines in documents.jsonl, current or stale
+        self._doc_lines: Dict[str, int] = {}
+        # Per-user locks keeping the index consistent with the file
+        self._doc_locks: Dict[str, asyncio.Lock] = {}
+
+        # Parsed documents per user, valid while documents.jsonl keeps the
+        # same (mtime, size)
+        self._doc_cache: Dict[str, Tuple[Tuple[int, int], List[Document]]] = {}
+        # Most recent messages per user, with the size of messages.jsonl they
+        # were read up to; since the file is append-only, only bytes past
+        # that size need to be parsed on the next read
+        self._message_cache: Dict[str, Tuple[int, Deque[Message]]] = {}
+        # Number of messages per user, with the size of messages.jsonl counted up to
+        self._message_counts: Dict[str, Tuple[int, int]] = {}
+        # Size of each user's directory, with the directory's st_mtime_ns it was
+        # computed at; appends don't change that mtime, so writes also drop the entry
+        self._storage_sizes: Dict[str, Tuple[int, int]] = {}
+
+        # Per-user serialized messages waiting to be appended to messages.jsonl,
+        # the scheduled flush of each buffer, and locks serializing the appends
+        self._msg_buffers: Dict[str, List[bytes]] = {}
+        self._msg_flush_tasks: Dict[str, asyncio.Task] = {}
+        self._msg_locks: Dict[str, asyncio.Lock] = {}
+
     def _get_user_dir(self, user_id: str) -> Path:
         """Get user's data directory, creating if needed."""
         user_dir = self.data_dir / str(user_id)
@@ -27,7 +113,11 @@ class FileStorage(BaseStorage):
         return user_dir
 
     def _get_documents_file(self, user_id: str) -> Path:
-        """Get path to user's documents.json file."""
+        """Get path to user's documents.jsonl file."""
+        return self._get_user_dir(user_id) / "documents.jsonl"
+
+    def _get_legacy_documents_file(self, user_id: str) -> Path:
+        """Get path to user's documents.json file from before documents.jsonl."""
         return self._get_user_dir(user_id) / "documents.json"
 
     def _get_messages_file(self, user_id: str) -> Path:
@@ -40,94 +130,285 @@ class FileStorage(BaseStorage):
         db_path.mkdir(exist_ok=True)
         return str(db_path)
 
-    async def save_document(self, user_id: str, document: Document) -> None:
-        """Save document metadata for a user."""
+    def _doc_lock(self, user_id: str) -> asyncio.Lock:
+        """Get the lock guarding a user's documents file."""
+        lock = self._doc_locks.get(user_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._doc_locks[user_id] = lock
+        return lock
+
+    async def _load_doc_index(self, user_id: str) -> Dict[str, Tuple[int, int]]:
+        """Get a user's document index, scanning documents.jsonl on first use.
+
+        Must be called with the user's document lock held.
+        """
+        index = self._doc_index.get(user_id)
+        if index is not None:
+            return index
+
         documents_file = self._get_documents_file(user_id)
+        if not documents_file.exists():
+            await self._migrate_legacy_documents(user_id)
 
-        # Load existing documents
-        documents = await self.get_documents(user_id)
+        index = {}
+        num_lines = 0
+        if documents_file.exists():
+            async with aiofiles.open(documents_file, 'rb') as f:
+                data = await f.read()
+
+            offset = 0
+            for line in data.splitlines(keepends=True):
+                if line.strip():
+                    num_lines += 1
+                    record = orjson.loads(line)
+                    if record.get('deleted'):
+                        index.pop(record['doc_id'], None)
+                    else:
+                        # Updating an existing key keeps the document's position
+                        index[record['doc_id']] = (offset, len(line))
+                offset += len(line)
+
+        self._doc_index[user_id] = index
+        self._doc_lines[user_id] = num_lines
+        return index
+
+    async def _migrate_legacy_documents(self, user_id: str) -> None:
+        """Convert a documents.json list into documents.jsonl, if present."""
+        legacy_file = self._get_legacy_documents_file(user_id)
+        if not legacy_file.exists():
+            return
+
+        async with aiofiles.open(legacy_file, 'rb') as f:
+            data = orjson.loads(await f.read())
+
+        await self._write_document_lines(
+            user_id, [orjson.dumps(doc_dict) + b'\n' for doc_dict in data]
+        )
+        legacy_file.unlink()
+
+    async def _write_document_lines(self, user_id: str, lines: List[bytes]) -> Dict[str, Tuple[int, int]]:
+        """Atomically replace documents.jsonl with the given lines.
+
+        Returns:
+            Index of the written documents
+        """
+        documents_file = self._get_documents_file(user_id)
+        tmp_file = documents_file.with_suffix('.jsonl.tmp')
 
-        # Check if document already exists and update or append
-        existing_idx = None
-        for idx, doc in enumerate(documents):
-            if doc.doc_id == document.doc_id:
-                existing_idx = idx
-                break
+        async with aiofiles.open(tmp_file, 'wb') as f:
+            await f.write(b''.join(lines))
+        os.replace(tmp_file, documents_file)
+        self._storage_sizes.pop(user_id, None)
 
-        if existing_idx is not None:
-            documents[existing_idx] = document
-        else:
-            documents.append(document)
+        index = {}
+        offset = 0
+        for line in lines:
+            index[orjson.loads(line)['doc_id']] = (offset, len(line))
+            offset += len(line)
+        return index
 
-        # Save back to file
-        async with aiofiles.open(documents_file, 'w') as f:
-            data = [doc.to_dict() for doc in documents]
-            await f.write(json.dumps(data, indent=2))
+    async def _append_document_line(self, user_id: str, record: dict) -> Tuple[int, int]:
+        """Append a record to documents.jsonl.
 
-    async def get_documents(self, user_id: str) -> List[Document]:
-        """Retrieve all documents for a user."""
-        documents_file = self._get_documents_file(user_id)
+        Returns:
+            Tuple of (offset, length) of the written line
+        """
+        line = orjson.dumps(record) + b'\n'
+        async with aiofiles.open(self._get_documents_file(user_id), 'ab') as f:
+            offset = await f.tell()
+            await f.write(line)
 
-        if not documents_file.exists():
-            return []
+        self._doc_lines[user_id] += 1
+        self._storage_sizes.pop(user_id, None)
+        return offset, len(line)
+
+    async def _maybe_compact_documents(self, user_id: str) -> None:
+        """Rewrite documents.jsonl without stale lines once there are enough of them."""
+        index = self._doc_index[user_id]
+        num_lines = self._doc_lines[user_id]
+        if num_lines - len(index) <= COMPACT_RATIO * num_lines:
+            return
+
+        async with aiofiles.open(self._get_documents_file(user_id), 'rb') as f:
+            data = await f.read()
 
-        async with aiofiles.open(documents_file, 'r') as f:
-            content = await f.read()
-            data = json.loads(content)
-            return [Document.from_dict(doc_dict) for doc_dict in data]
+        lines = [data[offset:offset + length] for offset, length in index.values()]
+        self._doc_index[user_id] = await self._write_document_lines(user_id, lines)
+        self._doc_lines[user_id] = len(lines)
+
+    async def save_document(self, user_id: str, document: Document) -> None:
+        """Save document metadata for a user."""
+        async with self._doc_lock(user_id):
+            index = await self._load_doc_index(user_id)
+            replaced = document.doc_id in index
+
+            index[document.doc_id] = await self._append_document_line(user_id, document.to_dict())
+            self._doc_cache.pop(user_id, None)
+
+            if replaced:
+                await self._maybe_compact_documents(user_id)
+
+    async def get_documents(self, user_id: str) -> List[Document]:
+        """Retrieve all documents for a user."""
+        async with self._doc_lock(user_id):
+            index = await self._load_doc_index(user_id)
+            if not index:
+                return []
+
+            documents_file = self._get_documents_file(user_id)
+            stat = os.stat(documents_file)
+            file_key = (stat.st_mtime_ns, stat.st_size)
+            cached = self._doc_cache.get(user_id)
+            if cached is not None and cached[0] == file_key:
+                return list(cached[1])
+
+            if stat.st_size > MMAP_THRESHOLD:
+                documents = await asyncio.to_thread(
+                    _read_documents_mmap, documents_file, list(index.values())
+                )
+            else:
+                async with aiofiles.open(documents_file, 'rb') as f:
+                    data = await f.read()
+
+                documents = [
+                    Document.from_dict(orjson.loads(data[offset:offset + length]))
+                    for offset, length in index.values()
+                ]
+            self._doc_cache[user_id] = (file_key, documents)
+
+        return list(documents)
 
     async def get_document(self, user_id: str, doc_id: str) -> Optional[Document]:
         """Retrieve a specific document for a user."""
-        documents = await self.get_documents(user_id)
-        for doc in documents:
-            if doc.doc_id == doc_id:
-                return doc
-        return None
+        async with self._doc_lock(user_id):
+            index = await self._load_doc_index(user_id)
+            location = index.get(doc_id)
+            if location is None:
+                return None
+
+            # Read just this document's line
+            offset, length = location
+            async with aiofiles.open(self._get_documents_file(user_id), 'rb') as f:
+                await f.seek(offset)
+                line = await f.read(length)
+
+        return Document.from_dict(orjson.loads(line))
 
     async def delete_document(self, user_id: str, doc_id: str) -> bool:
         """Delete a specific document for a user."""
-        documents = await self.get_documents(user_id)
-        new_documents = [doc for doc in documents if doc.doc_id != doc_id]
+        async with self._doc_lock(user_id):
+            index = await self._load_doc_index(user_id)
+            if doc_id not in index:
+                return False  # Document not found
 
-        if len(new_documents) == len(documents):
-            return False  # Document not found
-
-        # Save updated list
-        documents_file = self._get_documents_file(user_id)
-        async with aiofiles.open(documents_file, 'w') as f:
-            data = [doc.to_dict() for doc in new_documents]
-            await f.write(json.dumps(data, indent=2))
+            await self._append_document_line(user_id, {'doc_id': doc_id, 'deleted': True})
+            del index[doc_id]
+            self._doc_cache.pop(user_id, None)
+            await self._maybe_compact_documents(user_id)
 
         return True
 
     async def clear_documents(self, user_id: str) -> int:
         """Delete all documents for a user."""
-        documents = await self.get_documents(user_id)
-        count = len(documents)
+        async with self._doc_lock(user_id):
+            index = await self._load_doc_index(user_id)
+            count = len(index)
 
-        documents_file = self._get_documents_file(user_id)
-        if documents_file.exists():
-            async with aiofiles.open(documents_file, 'w') as f:
-                await f.write(json.dumps([], indent=2))
+            documents_file = self._get_documents_file(user_id)
+            if documents_file.exists():
+                async with aiofiles.open(documents_file, 'wb') as f:
+                    await f.write(b'')
+
+            self._doc_index[user_id] = {}
+            self._doc_lines[user_id] = 0
+            self._doc_cache.pop(user_id, None)
+            self._storage_sizes.pop(user_id, None)
 
         return count
 
     async def save_message(self, user_id: str, message: Message) -> None:
-        """Save conversation message (append to JSONL file)."""
-        messages_file = self._get_messages_file(user_id)
-
-        async with aiofiles.open(messages_file, 'a') as f:
-            await f.write(message.to_json() + '\n')
+        """Save conversation message (buffered, then appended to JSONL file)."""
+        await self.save_messages(user_id, [message])
+
+    async def save_messages(self, user_id: str, messages: List[Message]) -> None:
+        """Save several conversation messages (buffered, then appended together
+        with any others the user saves within MESSAGE_FLUSH_DELAY)."""
+        buffer = self._msg_buffers.setdefault(user_id, [])
+        buffer.extend(message.to_json_bytes() + b'\n' for message in messages)
+
+        if user_id not in self._msg_flush_tasks:
+            task = asyncio.create_task(self._flush_after(user_id))
+            task.add_done_callback(self._log_flush_error)
+            self._msg_flush_tasks[user_id] = task
+
+    @staticmethod
+    def _log_flush_error(task: asyncio.Task) -> None:
+        """Log the error of a failed background flush (its messages stay buffered)."""
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Failed to write buffered messages", exc_info=task.exception())
+
+    async def _flush_after(self, user_id: str) -> None:
+        """Flush a user's buffered messages once the flush delay has passed."""
+        await asyncio.sleep(MESSAGE_FLUSH_DELAY)
+        # Messages saved from here on schedule a new flush
+        self._msg_flush_tasks.pop(user_id, None)
+        await self._flush_messages(user_id)
+
+    async def _flush_messages(self, user_id: str) -> None:
+        """Append a user's buffered messages to messages.jsonl in one write."""
+        lock = self._msg_locks.get(user_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._msg_locks[user_id] = lock
+
+        async with lock:
+            buffer = self._msg_buffers.pop(user_id, None)
+            if not buffer:
+                return
+
+            messages_file = self._get_messages_file(user_id)
+            try:
+                # If this task is cancelled, the thread still completes the
+                # write, so the messages must not be buffered again then
+                await asyncio.to_thread(_append_and_sync, messages_file, b''.join(buffer))
+            except OSError:
+                # Keep the messages, ahead of any saved meanwhile, for the next flush
+                self._msg_buffers[user_id] = buffer + self._msg_buffers.get(user_id, [])
+                raise
+            self._storage_sizes.pop(user_id, None)
+
+    async def flush_all(self) -> None:
+        """Write out all buffered messages (call on application shutdown)."""
+        # Let scheduled flushes finish rather than interrupting their writes
+        tasks = list(self._msg_flush_tasks.values())
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        for user_id in list(self._msg_buffers):
+            await self._flush_messages(user_id)
 
     async def get_messages(self, user_id: str, limit: Optional[int] = None) -> List[Message]:
         """Retrieve recent conversation history."""
+        # Include messages still waiting in the write buffer
+        await self._flush_messages(user_id)
         messages_file = self._get_messages_file(user_id)
 
         if not messages_file.exists():
             return []
 
+        if limit and limit <= MESSAGE_CACHE_SIZE:
+            recent = await self._get_recent_messages(user_id)
+            return list(recent)[-limit:]
+
+        if limit:
+            # Only parse the lines that will be returned
+            data = await self._read_tail(messages_file, os.stat(messages_file).st_size, limit)
+            messages = [Message.from_json(line) for line in data.splitlines() if line.strip()]
+            return messages[-limit:]
+
         messages = []
-        async with aiofiles.open(messages_file, 'r') as f:
+        async with aiofiles.open(messages_file, 'rb') as f:
             async for line in f:
                 line = line.strip()
                 if line:
@@ -139,21 +420,104 @@ class FileStorage(BaseStorage):
 
         return messages
 
+    async def _get_recent_messages(self, user_id: str) -> Deque[Message]:
+        """Get a user's most recent messages, parsing only newly appended lines."""
+        messages_file = self._get_messages_file(user_id)
+        size = os.stat(messages_file).st_size
+
+        cached = self._message_cache.get(user_id)
+        if cached is not None and cached[0] == size:
+            return cached[1]
+
+        if cached is not None and cached[0] < size:
+            # Extend a copy, so concurrent readers never append the same lines twice
+            start, recent = cached[0], deque(cached[1], maxlen=MESSAGE_CACHE_SIZE)
+            async with aiofiles.open(messages_file, 'rb') as f:
+                await f.seek(start)
+                data = await f.read()
+        else:
+            # First read (or the file was replaced): only the tail is needed
+            recent = deque(maxlen=MESSAGE_CACHE_SIZE)
+            data = await self._read_tail(messages_file, size, MESSAGE_CACHE_SIZE)
+            start = size - len(data)
+
+        # Leave a partially written last line for the next read
+        end = data.rfind(b'\n') + 1
+        for line in data[:end].splitlines():
+            if line.strip():
+                recent.append(Message.from_json(line))
+
+        self._message_cache[user_id] = (start + end, recent)
+        return recent
+
+    async def _read_tail(self, path: Path, end: int, num_lines: int) -> bytes:
+        """Read the last lines of a file before offset `end`, reading backwards in blocks.
+
+        Args:
+            path: File to read
+            end: Offset to read up to (normally the file size)
+            num_lines: Number of complete lines wanted
+
+        Returns:
+            Bytes starting at a line boundary, holding at least `num_lines`
+            lines if the file has that many
+        """
+        data = b''
+        start = end
+        async with aiofiles.open(path, 'rb') as f:
+            # One more newline than lines wanted marks where the first line starts
+            while start > 0 and data.count(b'\n') <= num_lines:
+                block_start = max(0, start - TAIL_CHUNK_SIZE)
+                await f.seek(block_start)
+                data = await f.read(start - block_start) + data
+                start = block_start
+
+        if start > 0:
+            # Drop the partial line the first block started in
+            data = data[data.index(b'\n') + 1:]
+        return data
+
+    async def _count_messages(self, user_id: str) -> int:
+        """Count a user's messages by counting lines, without parsing them."""
+        await self._flush_messages(user_id)
+        messages_file = self._get_messages_file(user_id)
+        if not messages_file.exists():
+            return 0
+
+        size = os.stat(messages_file).st_size
+        cached = self._message_counts.get(user_id)
+        if cached is not None and cached[0] == size:
+            return cached[1]
+
+        # Messages are only appended, so only count lines past the last count
+        start, count = cached if cached is not None and cached[0] < size else (0, 0)
+        async with aiofiles.open(messages_file, 'rb') as f:
+            await f.seek(start)
+            while block := await f.read(TAIL_CHUNK_SIZE):
+                count += block.count(b'\n')
+                start += len(block)
+
+        self._message_counts[user_id] = (start, count)
+        return count
+
     async def get_user_stats(self, user_id: str) -> dict:
         """Get statistics for a user."""
         documents = await self.get_documents(user_id)
-        messages = await self.get_messages(user_id)
+        num_messages = await self._count_messages(user_id)
 
-        # Calculate storage size
+        # Calculate storage size (walking the directory off the event loop)
         user_dir = self._get_user_dir(user_id)
-        storage_size = 0
-        for file_path in user_dir.rglob('*'):
-            if file_path.is_file():
-                storage_size += file_path.stat().st_size
+        mtime_ns = user_dir.stat().st_mtime_ns
+        cached = self._storage_sizes.get(user_id)
+        if cached is not None and cached[0] == mtime_ns:
+            storage_size = cached[1]
+        else:
+            storage_size = await asyncio.to_thread(_dir_size, user_dir)
+            self._storage_sizes[user_id] = (mtime_ns, storage_size)
 
         return {
             'num_documents': len(documents),
-            'num_messages': len(messages),
+            'num_messages': num_messages,
             'storage_size_bytes': storage_size,
             'storage_size_mb': round(storage_size / (1024 * 1024), 2)
         }
@@ -1,13 +1,25 @@
 """Data models for storage layer."""
-from dataclasses import dataclass, asdict
+import sys
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, Dict, Any
-import json
+import orjson
+
+
+# Bound once, as it's called for every parsed document and message
+_fromisoformat = datetime.fromisoformat
+
+# Interned content types, shared by all loaded documents instead of one
+# string per parsed line
+_CONTENT_TYPES = {name: sys.intern(name) for name in ('web', 'youtube', 'pdf', 'github')}
 
 
 @dataclass
 class Document:
     """Represents a document stored in the RAG system."""
+    # No per-instance __dict__; a user's whole document list is kept in memory
+    __slots__ = ('doc_id', 'url', 'title', 'content_type', 'added_at', 'content_preview')
+
     doc_id: str
     url: str
     title: str
@@ -17,16 +29,26 @@ class Document:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
-        data = asdict(self)
-        data['added_at'] = self.added_at.isoformat()
-        return data
+        return {
+            'doc_id': self.doc_id,
+            'url': self.url,
+            'title': self.title,
+            'content_type': self.content_type,
+            'added_at': self.added_at.isoformat(),
+            'content_preview': self.content_preview
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Document':
         """Create Document from dictionary."""
-        data = data.copy()
-        data['added_at'] = datetime.fromisoformat(data['added_at'])
-        return cls(**data)
+        return cls(
+            data['doc_id'],
+            data['url'],
+            data['title'],
+            _CONTENT_TYPES.get(data['content_type'], data['content_type']),
+            _fromisoformat(data['added_at']),
+            data['content_preview']
+        )
 
 
 @dataclass
@@ -38,25 +60,51 @@ class Message:
     content: str
     is_bot: bool
     metadata: Optional[Dict[str, Any]] = None
+    # Serialized form, memoized by to_json_bytes (messages aren't modified once saved)
+    _cached_json: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
-        data = asdict(self)
-        data['timestamp'] = self.timestamp.isoformat()
-        return data
+        return {
+            'message_id': self.message_id,
+            'user_id': self.user_id,
+            'timestamp': self.timestamp.isoformat(),
+            'content': self.content,
+            'is_bot': self.is_bot,
+            'metadata': self.metadata
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Message':
         """Create Message from dictionary."""
-        data = data.copy()
-        data['timestamp'] = datetime.fromisoformat(data['timestamp'])
-        return cls(**data)
+        return cls(
+            data['message_id'],
+            data['user_id'],
+            _fromisoformat(data['timestamp']),
+            data['content'],
+            data['is_bot'],
+            data.get('metadata')
+        )
 
     def to_json(self) -> str:
         """Convert to JSON string for JSONL storage."""
-        return json.dumps(self.to_dict())
+        return self.to_json_bytes().decode()
+
+    def to_json_bytes(self) -> bytes:
+        """Convert to UTF-8 encoded JSON for JSONL storage."""
+        if self._cached_json is None:
+            # orjson writes the datetime itself, in the same format as isoformat()
+            self._cached_json = orjson.dumps({
+                'message_id': self.message_id,
+                'user_id': self.user_id,
+                'timestamp': self.timestamp,
+                'content': self.content,
+                'is_bot': self.is_bot,
+                'metadata': self.metadata
+            })
+        return self._cached_json
 
     @classmethod
-    def from_json(cls, json_str: str) -> 'Message':
-        """Create Message from JSON string."""
-        return cls.from_dict(json.loads(json_str))
+    def from_json(cls, json_str) -> 'Message':
+        """Create Message from JSON string (or UTF-8 bytes)."""
+        return cls.from_dict(orjson.loads(json_str))
@@ -1,12 +1,17 @@
 """Configuration loader and manager."""
-import json
 import os
+from functools import cached_property
 from pathlib import Path
 from typing import Dict, Any
+import orjson
 
 
 class Config:
-    """Configuration loader and manager."""
+    """Configuration loader and manager.
+
+    Settings are read from the loaded config once, on first access, and
+    then served as plain instance attributes.
+    """
 
     def __init__(self, config_path: str = "data/config.json"):
         """Initialize config loader.
@@ -25,8 +30,7 @@ class Config:
                 "Please create data/config.json with your API keys."
             )
 
-        with open(self.config_path) as f:
-            config = json.load(f)
+        config = orjson.loads(self.config_path.read_bytes())
 
         # Allow environment variables to override config file
         if os.getenv("TELEGRAM_BOT_TOKEN"):
@@ -36,41 +40,71 @@ class Config:
 
         return config
 
-    @property
+    @cached_property
     def telegram_token(self) -> str:
         """Get Telegram bot token."""
         return self._config["telegram_token"]
 
-    @property
+    @cached_property
     def openai_api_key(self) -> str:
         """Get OpenAI API key."""
         return self._config["openai_api_key"]
 
-    @property
+    @cached_property
     def data_dir(self) -> str:
         """Get data directory path."""
         return self._config.get("data_dir", "data")
 
-    @property
+    @cached_property
     def conversation_history_limit(self) -> int:
         """Get conversation history limit."""
         return self._config.get("conversation_history_limit", 20)
 
-    @property
+    @cached_property
     def openai_model(self) -> str:
         """Get OpenAI model name."""
         return self._config.get("openai_model", "gpt-4-turbo-preview")
 
-    @property
+    @cached_property
     def embedding_model(self) -> str:
         """Get embedding model name."""
         return self._config.get("embedding_model", "text-embedding-3-small")
 
-    @property
+    @cached_property
     def max_document_preview_length(self) -> int:
         """Get maximum document preview length."""
         return self._config.get("max_document_preview_length", 200)
 
+    @cached_property
+    def max_summary_input_tokens(self) -> int:
+        """Get maximum number of content tokens sent for summarization."""
+        return self._config.get("max_summary_input_tokens", 4000)
+
+    @cached_property
+    def max_requests_per_host(self) -> int:
+        """Get maximum concurrent content requests per host."""
+        return self._config.get("max_requests_per_host", 8)
+
+    @cached_property
+    def rag_manager_cache_size(self) -> int:
+        """Get maximum number of per-user RAG managers kept in memory."""
+        return self._config.get("rag_manager_cache_size", 256)
+
+    @cached_property
+    def hnsw_m(self) -> int:
+        """Get HNSW graph links per node for new vector collections."""
+        return self._config.get("hnsw_m", 16)
+
+    @cached_property
+    def hnsw_construction_ef(self) -> int:
+        """Get HNSW build-time candidate list size for new vector collections."""
+        return self._config.get("hnsw_construction_ef", 100)
+
+    @cached_property
+    def hnsw_search_ef(self) -> int:
+        """Get HNSW query-time candidate list size."""
+        return self._config.get("hnsw_search_ef", 64)
+
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value by key.
 
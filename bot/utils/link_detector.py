@@ -1,22 +1,28 @@
 """URL detection and classification utilities."""
 import re
+from functools import lru_cache
 from typing import Optional, Literal
+from urllib.parse import urlsplit
 
 
 ContentType = Literal["web", "youtube", "pdf", "github"]
 
+# Compiled once at import; read as a module global in the methods below
+URL_PATTERN = re.compile(r'https?://[^\s]+')
+
+# extract_url first looks for a URL in this many leading characters, where
+# one usually is, before scanning the whole message
+URL_PRESCAN_LENGTH = 512
+
+# Hosts serving YouTube watch pages (youtu.be short links are handled apart)
+YOUTUBE_HOSTS = frozenset({'youtube.com', 'www.youtube.com', 'm.youtube.com', 'music.youtube.com'})
+
 
 class LinkDetector:
     """Detects and classifies URLs in messages."""
 
-    YOUTUBE_PATTERN = re.compile(
-        r'(?:https?://)?(?:www\.)?(?:youtube\.com/watch\?v=|youtu\.be/)[\w-]+'
-    )
-    GITHUB_PATTERN = re.compile(
-        r'https?://github\.com/[\w-]+/[\w-]+'
-    )
-    PDF_PATTERN = re.compile(r'\.pdf(?:\?|$|#)', re.IGNORECASE)
-    URL_PATTERN = re.compile(r'https?://[^\s]+')
+    # Kept as a class attribute for existing callers
+    URL_PATTERN = URL_PATTERN
 
     @staticmethod
     def extract_url(text: str) -> Optional[str]:
@@ -28,12 +34,18 @@ class LinkDetector:
         Returns:
             URL string if found, None otherwise
         """
-        match = LinkDetector.URL_PATTERN.search(text)
+        match = URL_PATTERN.search(text, 0, URL_PRESCAN_LENGTH)
+        if match is None:
+            match = URL_PATTERN.search(text)
+        elif match.end() == URL_PRESCAN_LENGTH:
+            # The URL may run on past the prescanned part
+            match = URL_PATTERN.match(text, match.start())
         return match.group(0) if match else None
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def classify_url(url: str) -> ContentType:
-        """Determine content type from URL.
+        """Determine content type from URL (memoized, as links are often resent).
 
         Args:
             url: URL to classify
@@ -41,14 +53,30 @@ class LinkDetector:
         Returns:
             Content type (web, youtube, pdf, github)
         """
-        if LinkDetector.YOUTUBE_PATTERN.search(url):
-            return "youtube"
-        elif LinkDetector.GITHUB_PATTERN.search(url):
-            return "github"
-        elif LinkDetector.PDF_PATTERN.search(url):
-            return "pdf"
-        else:
+        # Classify by the parsed host and path rather than scanning the whole URL
+        try:
+            parts = urlsplit(url)
+        except ValueError:
             return "web"
+        host = parts.hostname or ''
+        path = parts.path
+
+        if host in YOUTUBE_HOSTS:
+            if path == '/watch' and parts.query.startswith('v='):
+                return "youtube"
+        elif host == 'youtu.be':
+            if len(path) > 1:
+                return "youtube"
+        elif host == 'github.com':
+            # Repository URLs: /owner/repo[/...]
+            segments = path.split('/', 3)
+            if len(segments) >= 3 and segments[1] and segments[2]:
+                return "github"
+
+        # Only the extension needs lowercasing, not the whole path
+        if path[-4:].lower() == '.pdf':
+            return "pdf"
+        return "web"
 
     @staticmethod
     def is_url(text: str) -> bool:
@@ -60,4 +88,4 @@ class LinkDetector:
         Returns:
             True if text contains URL, False otherwise
         """
-        return LinkDetector.extract_url(text) is not None
+        return URL_PATTERN.search(text) is not None
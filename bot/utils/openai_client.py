@@ -0,0 +1,37 @@
+"""Shared OpenAI client."""
+from typing import Dict
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+
+# Process-wide clients keyed by API key, so all users and handlers share
+# one connection pool instead of opening their own (created lazily)
+_clients: Dict[str, AsyncOpenAI] = {}
+
+
+def get_openai_client(api_key: str) -> AsyncOpenAI:
+    """Get the shared OpenAI client for an API key, creating it once.
+
+    Args:
+        api_key: OpenAI API key
+
+    Returns:
+        Shared AsyncOpenAI client
+    """
+    client = _clients.get(api_key)
+    if client is None:
+        client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(max_connections=200, max_keepalive_connections=100)
+            )
+        )
+        _clients[api_key] = client
+    return client
+
+
+async def close_openai_clients() -> None:
+    """Close all shared OpenAI clients (call on application shutdown)."""
+    while _clients:
+        _, client = _clients.popitem()
+        await client.close()
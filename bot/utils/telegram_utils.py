@@ -3,6 +3,10 @@ from telegram import Update
 from telegram.error import BadRequest
 
 
+# Characters with a meaning in Telegram's (legacy) Markdown parse mode
+MARKDOWN_ENTITY_CHARS = frozenset('_*`[')
+
+
 async def send_markdown_message(update: Update, text: str) -> None:
     """Send message with Markdown formatting, fallback to plain text on error.
 
@@ -13,6 +17,10 @@ async def send_markdown_message(update: Update, text: str) -> None:
     Returns:
         Message object that was sent
     """
+    if MARKDOWN_ENTITY_CHARS.isdisjoint(text):
+        # Nothing to format, so skip Markdown parsing (and its failure modes)
+        return await update.message.reply_text(text)
+
     try:
         # Try to send with Markdown formatting
         return await update.message.reply_text(text, parse_mode='Markdown')
@@ -1,8 +1,34 @@
 """Text formatting and utility functions."""
-from typing import List
+import logging
+import time
+from operator import attrgetter
+from typing import Dict, List
+import tiktoken
 from bot.storage.models import Document
 
 
+logger = logging.getLogger(__name__)
+
+# Fetches (title, url) of a document in one call
+_title_and_url = attrgetter('title', 'url')
+
+# Rough characters-per-token ratio, used when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+# Seconds before loading a tokenizer is retried after it failed (e.g. offline)
+ENCODING_RETRY_INTERVAL = 60
+
+# Loaded tokenizers per model, and the time.monotonic() of each model's last
+# failed load; failures are not cached, only retried at most this often
+_encodings: Dict[str, object] = {}
+_encoding_failures: Dict[str, float] = {}
+
+# Characters escaped by escape_markdown, and the table mapping each one to
+# its backslash-escaped form (applied in a single pass by str.translate)
+MARKDOWN_SPECIAL_CHARS = ['_', '*', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!']
+_MARKDOWN_ESCAPE_TABLE = str.maketrans({char: '\\' + char for char in MARKDOWN_SPECIAL_CHARS})
+
+
 def format_document_list(documents: List[Document]) -> str:
     """Format list of documents as markdown.
 
@@ -15,11 +41,10 @@ def format_document_list(documents: List[Document]) -> str:
     if not documents:
         return "No documents in your collection yet."
 
-    lines = ["Your document collection:"]
-    for doc in documents:
-        lines.append(f"- [{doc.title}]({doc.url})")
-
-    return "\n".join(lines)
+    return "\n".join([
+        "Your document collection:",
+        *[f"- [{title}]({url})" for title, url in map(_title_and_url, documents)]
+    ])
 
 
 def truncate_text(text: str, max_length: int = 200) -> str:
@@ -35,7 +60,71 @@ def truncate_text(text: str, max_length: int = 200) -> str:
     if len(text) <= max_length:
         return text
 
-    return text[:max_length - 3] + "..."
+    return f"{text[:max_length - 3]}..."
+
+
+def load_encoding(model: str):
+    """Load the tokenizer for a model, once per model.
+
+    A failed load is retried on a later call, at most once every
+    ENCODING_RETRY_INTERVAL seconds.
+
+    Args:
+        model: OpenAI model name
+
+    Returns:
+        tiktoken encoding, or None if it could not be loaded (e.g. offline)
+    """
+    encoding = _encodings.get(model)
+    if encoding is not None:
+        return encoding
+
+    failed_at = _encoding_failures.get(model)
+    if failed_at is not None and time.monotonic() - failed_at < ENCODING_RETRY_INTERVAL:
+        return None
+
+    try:
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"Could not load tokenizer, counting tokens by characters: {e}")
+        _encoding_failures[model] = time.monotonic()
+        return None
+
+    _encodings[model] = encoding
+    _encoding_failures.pop(model, None)
+    return encoding
+
+
+def chunk_text(text: str, encoding, max_tokens: int, overlap: int = 0) -> List[str]:
+    """Split text into overlapping chunks of at most max_tokens tokens.
+
+    Args:
+        text: Text to split
+        encoding: tiktoken encoding, or None to approximate tokens by characters
+        max_tokens: Maximum tokens per chunk
+        overlap: Tokens shared between consecutive chunks
+
+    Returns:
+        List of chunks (a single chunk if the text fits)
+    """
+    if encoding is None:
+        units = text
+        max_tokens *= CHARS_PER_TOKEN
+        overlap *= CHARS_PER_TOKEN
+    else:
+        units = encoding.encode(text, disallowed_special=())
+
+    if len(units) <= max_tokens:
+        return [text]
+
+    step = max_tokens - overlap
+    chunks = [units[start:start + max_tokens] for start in range(0, len(units) - overlap, step)]
+    if encoding is None:
+        return chunks
+    return [encoding.decode(chunk) for chunk in chunks]
 
 
 def escape_markdown(text: str) -> str:
@@ -47,7 +136,4 @@ def escape_markdown(text: str) -> str:
     Returns:
         Escaped text safe for markdown
     """
-    special_chars = ['_', '*', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!']
-    for char in special_chars:
-        text = text.replace(char, f'\\{char}')
-    return text
+    return text.translate(_MARKDOWN_ESCAPE_TABLE)
@@ -0,0 +1,78 @@
+"""Tests for shared content processor helpers."""
+import asyncio
+
+import pytest
+
+from bot.content_processors.github_processor import GitHubProcessor
+
+
+class FakeResponse:
+    """Minimal aiohttp response stand-in."""
+
+    def __init__(self, status, body):
+        self.status = status
+        self._body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def text(self):
+        if isinstance(self._body, Exception):
+            raise self._body
+        return self._body
+
+
+class FakeSession:
+    """Session whose responses are looked up by URL, with optional delays."""
+
+    def __init__(self, responses, delays=None):
+        self.responses = responses
+        self.delays = delays or {}
+        self.cancelled = []
+
+    def get(self, url, timeout=None):
+        session = self
+
+        class Request:
+            async def __aenter__(self):
+                try:
+                    await asyncio.sleep(session.delays.get(url, 0))
+                except asyncio.CancelledError:
+                    session.cancelled.append(url)
+                    raise
+                return session.responses[url]
+
+            async def __aexit__(self, *exc_info):
+                return False
+
+        return Request()
+
+
+@pytest.mark.asyncio
+async def test_race_first_ok_skips_failing_candidates(monkeypatch):
+    """Test that an unexpected error in one request doesn't discard the others."""
+    session = FakeSession(
+        {
+            "https://a.test/bad": FakeResponse(200, ValueError("bad body")),
+            "https://a.test/ok": FakeResponse(200, "readme"),
+            "https://a.test/slow": FakeResponse(200, "late"),
+        },
+        delays={"https://a.test/ok": 0.01, "https://a.test/slow": 10},
+    )
+    processor = GitHubProcessor()
+
+    async def get_session():
+        return session
+
+    monkeypatch.setattr(processor, "get_session", get_session)
+
+    result = await processor.race_first_ok(
+        ["https://a.test/bad", "https://a.test/ok", "https://a.test/slow"]
+    )
+
+    assert result == ("https://a.test/ok", "readme")
+    # The losing request was cancelled and awaited before returning
+    assert session.cancelled == ["https://a.test/slow"]
@@ -121,3 +121,15 @@ def test_classify_priority_pdf_over_web():
     url = "https://example.com/document.pdf"
     content_type = LinkDetector.classify_url(url)
     assert content_type == "pdf"
+
+
+def test_classify_by_host_not_query():
+    """Test that links embedded in another URL's query don't decide its type."""
+    assert LinkDetector.classify_url("https://example.com/?u=https://github.com/user/repo") == "web"
+    assert LinkDetector.classify_url("https://example.com/share?to=youtube.com/watch?v=abc") == "web"
+    assert LinkDetector.classify_url("https://m.youtube.com/watch?v=abc123") == "youtube"
+
+
+def test_classify_youtube_music_url():
+    """Test that YouTube Music watch links are classified as YouTube."""
+    assert LinkDetector.classify_url("https://music.youtube.com/watch?v=abc123") == "youtube"
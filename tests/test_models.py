@@ -157,6 +157,25 @@ def test_message_from_json():
     assert msg.metadata == {"source": "test"}
 
 
+def test_message_to_json_is_memoized():
+    """Test that a message is serialized once and compares without the cache."""
+    msg = Message(
+        message_id="cached",
+        user_id="user1",
+        timestamp=datetime.now(),
+        content="Cached message",
+        is_bot=False
+    )
+
+    json_bytes = msg.to_json_bytes()
+
+    assert msg.to_json_bytes() is json_bytes
+    assert msg.to_json() == json_bytes.decode()
+    assert json.loads(json_bytes)['timestamp'] == msg.timestamp.isoformat()
+    assert Message.from_json(json_bytes) == msg
+    assert "_cached_json" not in repr(msg)
+
+
 def test_message_roundtrip():
     """Test Message serialization roundtrip."""
     original = Message(
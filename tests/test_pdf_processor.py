@@ -0,0 +1,20 @@
+"""Tests for PDF document naming."""
+import pytest
+
+from bot.content_processors.pdf_processor import PDFProcessor
+
+
+@pytest.mark.asyncio
+async def test_document_name_from_first_text_line():
+    """Test that the first non-heading line names a PDF without a usable filename."""
+    content = "# Heading\n\nReal Title\nsecond"
+    name = await PDFProcessor().get_document_name("https://example.com/download", content)
+    assert name == "Real Title"
+
+
+@pytest.mark.asyncio
+async def test_document_name_skips_leading_unicode_whitespace():
+    """Test that a first line indented with a non-breaking space is still used."""
+    content = "\u00a0Real Title\nsecond"
+    name = await PDFProcessor().get_document_name("https://example.com/download", content)
+    assert name == "Real Title"
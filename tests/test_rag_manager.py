@@ -0,0 +1,107 @@
+"""Tests for RAG document rollback."""
+import shutil
+import tempfile
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from chromadb.api.types import EmbeddingFunction
+
+import bot.rag.embedding_store as embedding_store
+import bot.rag.rag_manager as rag_manager
+from bot.rag.rag_manager import RAGManager
+from bot.storage.file_storage import FileStorage
+
+
+class FakeEmbeddingFunction(EmbeddingFunction):
+    """Deterministic offline embedding function that can be made to fail."""
+
+    fail = False
+
+    def __init__(self):
+        pass
+
+    def __call__(self, input):
+        if FakeEmbeddingFunction.fail:
+            raise RuntimeError("embedding failed")
+        return [np.array([float(len(text)), 1.0], dtype=np.float32) for text in input]
+
+    @staticmethod
+    def name() -> str:
+        return "fake"
+
+    def get_config(self):
+        return {}
+
+    @staticmethod
+    def build_from_config(config):
+        return FakeEmbeddingFunction()
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    """Create a RAG manager over temporary storage and an offline embedding function."""
+    FakeEmbeddingFunction.fail = False
+    monkeypatch.setattr(embedding_store, "EMBEDDING_FUNCTION", FakeEmbeddingFunction())
+    monkeypatch.setattr(rag_manager, "load_encoding", lambda model: None)
+
+    temp_dir = tempfile.mkdtemp()
+    config = SimpleNamespace(
+        openai_api_key="test-key",
+        openai_model="test-model",
+        max_document_preview_length=200,
+        hnsw_m=16,
+        hnsw_construction_ef=100,
+        hnsw_search_ef=64
+    )
+    yield RAGManager("user1", FileStorage(temp_dir), config, prompt_manager=None)
+    shutil.rmtree(temp_dir)
+
+
+def _stored_chunks(manager, doc_id):
+    """Get the stored chunk texts of a document."""
+    return manager.embedding_store.collection.get(where={'doc_id': doc_id})['documents']
+
+
+@pytest.mark.asyncio
+async def test_failed_embedding_keeps_previous_version(manager):
+    """Test that a failed embedding restores the previous document and keeps its chunks."""
+    url = "https://example.com/article"
+    document = await manager.add_document(url, "first version", "First", "web")
+
+    FakeEmbeddingFunction.fail = True
+    with pytest.raises(RuntimeError):
+        await manager.add_document(url, "second version", "Second", "web")
+
+    stored = await manager.storage.get_document("user1", document.doc_id)
+    assert stored.title == "First"
+    assert _stored_chunks(manager, document.doc_id) == ["first version"]
+
+
+@pytest.mark.asyncio
+async def test_failed_storage_save_keeps_previous_embeddings(manager, monkeypatch):
+    """Test that a failed storage save leaves the previous version's chunks in place."""
+    url = "https://example.com/article"
+    document = await manager.add_document(url, "first version", "First", "web")
+
+    async def failing_save(user_id, doc):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(manager.storage, "save_document", failing_save)
+    with pytest.raises(OSError):
+        await manager.add_document(url, "second version", "Second", "web")
+
+    stored = await manager.storage.get_document("user1", document.doc_id)
+    assert stored.title == "First"
+    assert _stored_chunks(manager, document.doc_id) == ["first version"]
+
+
+@pytest.mark.asyncio
+async def test_replacing_with_fewer_chunks_drops_stale_ones(manager):
+    """Test that chunks past the new version's chunk count are removed."""
+    url = "https://example.com/article"
+    document = await manager.add_document(url, "x" * 3000, "Long", "web")
+    assert len(_stored_chunks(manager, document.doc_id)) > 1
+
+    await manager.add_document(url, "short", "Short", "web")
+    assert _stored_chunks(manager, document.doc_id) == ["short"]
@@ -1,4 +1,5 @@
 """Tests for storage layer."""
+import json
 import pytest
 import tempfile
 import shutil
@@ -100,6 +101,81 @@ async def test_clear_documents(temp_storage):
     assert len(documents) == 0
 
 
+@pytest.mark.asyncio
+async def test_documents_persist_after_update_and_delete(temp_storage):
+    """Test that updates and deletions are replayed from disk, keeping list order."""
+    for i in range(3):
+        doc = Document(
+            doc_id=f"doc{i}",
+            url=f"https://example.com/{i}",
+            title=f"Document {i}",
+            content_type="web",
+            added_at=datetime.now(),
+            content_preview=f"Preview {i}"
+        )
+        await temp_storage.save_document("user1", doc)
+
+    updated = Document(
+        doc_id="doc0",
+        url="https://example.com/0",
+        title="Updated Document 0",
+        content_type="web",
+        added_at=datetime.now(),
+        content_preview="Preview 0"
+    )
+    await temp_storage.save_document("user1", updated)
+    await temp_storage.delete_document("user1", "doc1")
+
+    # A fresh instance has to rebuild its index from the file
+    reloaded = FileStorage(str(temp_storage.data_dir))
+    documents = await reloaded.get_documents("user1")
+
+    assert [doc.doc_id for doc in documents] == ["doc0", "doc2"]
+    assert documents[0].title == "Updated Document 0"
+    assert (await reloaded.get_document("user1", "doc2")).title == "Document 2"
+    assert await reloaded.get_document("user1", "doc1") is None
+
+
+@pytest.mark.asyncio
+async def test_get_documents_memory_mapped(temp_storage, monkeypatch):
+    """Test reading documents through the memory-mapped path used for large files."""
+    monkeypatch.setattr("bot.storage.file_storage.MMAP_THRESHOLD", 0)
+    for i in range(3):
+        doc = Document(
+            doc_id=f"doc{i}",
+            url=f"https://example.com/{i}",
+            title=f"Document {i}",
+            content_type="web",
+            added_at=datetime.now(),
+            content_preview=f"Preview {i}"
+        )
+        await temp_storage.save_document("user1", doc)
+
+    documents = await temp_storage.get_documents("user1")
+    assert [doc.title for doc in documents] == ["Document 0", "Document 1", "Document 2"]
+
+
+@pytest.mark.asyncio
+async def test_legacy_documents_json_is_migrated(temp_storage):
+    """Test that a documents.json list from older versions is still read."""
+    doc = Document(
+        doc_id="legacy",
+        url="https://example.com/legacy",
+        title="Legacy Document",
+        content_type="pdf",
+        added_at=datetime.now(),
+        content_preview="Preview"
+    )
+    legacy_file = temp_storage.data_dir / "user1" / "documents.json"
+    legacy_file.parent.mkdir()
+    legacy_file.write_text(json.dumps([doc.to_dict()], indent=2))
+
+    documents = await temp_storage.get_documents("user1")
+
+    assert [d.title for d in documents] == ["Legacy Document"]
+    assert not legacy_file.exists()
+
+
 @pytest.mark.asyncio
 async def test_save_and_get_messages(temp_storage):
     """Test saving and retrieving messages."""
@@ -127,6 +203,81 @@ async def test_save_and_get_messages(temp_storage):
     assert messages[1].is_bot is True
 
 
+@pytest.mark.asyncio
+async def test_save_messages_bulk(temp_storage):
+    """Test saving several messages at once keeps their order."""
+    msgs = [
+        Message(
+            message_id=f"msg{i}",
+            user_id="user1",
+            timestamp=datetime.now(),
+            content=f"Message {i}",
+            is_bot=bool(i % 2)
+        )
+        for i in range(3)
+    ]
+
+    await temp_storage.save_messages("user1", msgs)
+
+    messages = await temp_storage.get_messages("user1")
+    assert [m.content for m in messages] == ["Message 0", "Message 1", "Message 2"]
+    assert messages[1].is_bot is True
+
+
+@pytest.mark.asyncio
+async def test_saved_messages_are_buffered_until_flush(temp_storage):
+    """Test that a burst of messages is appended in one write on flush."""
+    for i in range(5):
+        await temp_storage.save_message("user1", Message(
+            message_id=f"msg{i}",
+            user_id="user1",
+            timestamp=datetime.now(),
+            content=f"Message {i}",
+            is_bot=False
+        ))
+
+    messages_file = Path(temp_storage.data_dir) / "user1" / "messages.jsonl"
+    assert not messages_file.exists()
+
+    await temp_storage.flush_all()
+
+    lines = messages_file.read_text(encoding='utf-8').splitlines()
+    assert [json.loads(line)['content'] for line in lines] == [f"Message {i}" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_messages_once(temp_storage, monkeypatch):
+    """Test that messages from a failed write are written exactly once later."""
+    import bot.storage.file_storage as file_storage
+
+    real_append = file_storage._append_and_sync
+    calls = []
+
+    def flaky_append(path, data):
+        calls.append(data)
+        if len(calls) == 1:
+            raise OSError("disk full")
+        real_append(path, data)
+
+    monkeypatch.setattr(file_storage, "_append_and_sync", flaky_append)
+
+    for i in range(2):
+        await temp_storage.save_message("user1", Message(
+            message_id=f"msg{i}",
+            user_id="user1",
+            timestamp=datetime.now(),
+            content=f"Message {i}",
+            is_bot=False
+        ))
+
+    # The scheduled flush fails and is logged; its messages stay buffered
+    await temp_storage.flush_all()
+    assert len(calls) == 2
+
+    messages = await temp_storage.get_messages("user1")
+    assert [m.content for m in messages] == ["Message 0", "Message 1"]
+
+
 @pytest.mark.asyncio
 async def test_get_messages_with_limit(temp_storage):
     """Test retrieving limited number of messages."""
@@ -146,6 +297,61 @@ async def test_get_messages_with_limit(temp_storage):
     assert messages[-1].content == "Message 9"
 
 
+@pytest.mark.asyncio
+async def test_get_messages_sees_new_messages(temp_storage):
+    """Test that recent messages read after more are appended include the new ones."""
+    for i in range(3):
+        msg = Message(
+            message_id=f"msg{i}",
+            user_id="user1",
+            timestamp=datetime.now(),
+            content=f"Message {i}",
+            is_bot=False
+        )
+        await temp_storage.save_message("user1", msg)
+
+    messages = await temp_storage.get_messages("user1", limit=2)
+    assert [m.content for m in messages] == ["Message 1", "Message 2"]
+
+    for i in range(3, 5):
+        msg = Message(
+            message_id=f"msg{i}",
+            user_id="user1",
+            timestamp=datetime.now(),
+            content=f"Message {i}",
+            is_bot=False
+        )
+        await temp_storage.save_message("user1", msg)
+
+    messages = await temp_storage.get_messages("user1", limit=3)
+    assert [m.content for m in messages] == ["Message 2", "Message 3", "Message 4"]
+
+
+@pytest.mark.asyncio
+async def test_get_messages_reads_tail_in_blocks(temp_storage, monkeypatch):
+    """Test limited reads that walk back over several blocks of the file."""
+    monkeypatch.setattr("bot.storage.file_storage.TAIL_CHUNK_SIZE", 64)
+    messages = [
+        Message(
+            message_id=f"msg{i}",
+            user_id="user1",
+            timestamp=datetime.now(),
+            content=f"Message {i}",
+            is_bot=False
+        )
+        for i in range(50)
+    ]
+    await temp_storage.save_messages("user1", messages)
+
+    recent = await temp_storage.get_messages("user1", limit=5)
+    assert [m.content for m in recent] == [f"Message {i}" for i in range(45, 50)]
+
+    # More than the in-memory cache holds, and more than the file has
+    everything = await temp_storage.get_messages("user1", limit=1000)
+    assert len(everything) == 50
+    assert everything[0].content == "Message 0"
+
+
 @pytest.mark.asyncio
 async def test_user_stats(temp_storage):
     """Test getting user statistics."""
@@ -174,6 +380,37 @@ async def test_user_stats(temp_storage):
     assert stats['storage_size_bytes'] > 0
 
 
+@pytest.mark.asyncio
+async def test_user_stats_storage_size_follows_writes(temp_storage):
+    """Test that the storage size reflects a save or delete made right before."""
+    doc = Document(
+        doc_id="size_test",
+        url="https://example.com",
+        title="Size Test",
+        content_type="web",
+        added_at=datetime.now(),
+        content_preview="Preview"
+    )
+    await temp_storage.save_document("user1", doc)
+    size_after_save = (await temp_storage.get_user_stats("user1"))['storage_size_bytes']
+
+    await temp_storage.delete_document("user1", "size_test")
+    size_after_delete = (await temp_storage.get_user_stats("user1"))['storage_size_bytes']
+    assert size_after_delete != size_after_save
+
+    msg = Message(
+        message_id="size_msg",
+        user_id="user1",
+        timestamp=datetime.now(),
+        content="Test message",
+        is_bot=False
+    )
+    await temp_storage.save_message("user1", msg)
+    await temp_storage.flush_all()
+    size_after_message = (await temp_storage.get_user_stats("user1"))['storage_size_bytes']
+    assert size_after_message > size_after_delete
+
+
 @pytest.mark.asyncio
 async def test_multiple_users_isolation(temp_storage):
     """Test that users' data is isolated."""
@@ -2,7 +2,7 @@
 import pytest
 from datetime import datetime
 
-from bot.utils.text_utils import format_document_list, truncate_text, escape_markdown
+from bot.utils.text_utils import format_document_list, truncate_text, escape_markdown, chunk_text
 from bot.storage.models import Document
 
 
@@ -138,3 +138,45 @@ def test_truncate_with_spaces():
     result = truncate_text(text, max_length=50)
     assert len(result) == 50
     assert result.endswith("...")
+
+
+def test_chunk_text_short():
+    """Test that text within the limit is a single chunk."""
+    assert chunk_text("short text", None, 100) == ["short text"]
+
+
+def test_chunk_text_overlap():
+    """Test splitting text into overlapping chunks (by characters without a tokenizer)."""
+    text = "".join(str(i % 10) for i in range(20))
+    chunks = chunk_text(text, None, max_tokens=2, overlap=1)
+
+    assert chunks == ["01234567", "45678901", "89012345", "23456789"]
+    assert all(len(chunk) <= 8 for chunk in chunks)
+
+
+def test_load_encoding_retries_after_failure(monkeypatch):
+    """Test that a failed tokenizer load isn't cached for good."""
+    from bot.utils import text_utils
+
+    sentinel = object()
+    calls = []
+
+    def fake_encoding_for_model(model):
+        calls.append(model)
+        if len(calls) == 1:
+            raise OSError("offline")
+        return sentinel
+
+    monkeypatch.setattr(text_utils.tiktoken, "encoding_for_model", fake_encoding_for_model)
+    monkeypatch.setattr(text_utils, "_encodings", {})
+    monkeypatch.setattr(text_utils, "_encoding_failures", {})
+
+    assert text_utils.load_encoding("test-model") is None
+    # Within the retry interval the failure is reused
+    assert text_utils.load_encoding("test-model") is None
+    assert len(calls) == 1
+
+    monkeypatch.setattr(text_utils, "ENCODING_RETRY_INTERVAL", 0)
+    assert text_utils.load_encoding("test-model") is sentinel
+    assert text_utils.load_encoding("test-model") is sentinel
+    assert len(calls) == 2
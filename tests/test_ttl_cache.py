@@ -0,0 +1,60 @@
+"""Tests for the TTL cache."""
+import pytest
+
+from bot.utils.cache import TTLCache
+
+
+def test_cache_get_and_set():
+    """Test storing and retrieving a value."""
+    cache = TTLCache(maxsize=4, ttl=60)
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+
+
+def test_cache_miss_returns_default():
+    """Test that a missing key returns the default."""
+    cache = TTLCache()
+    assert cache.get("missing") is None
+    assert cache.get("missing", "fallback") == "fallback"
+
+
+def test_cache_evicts_least_recently_used():
+    """Test that the least recently used entry is evicted when full."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # Touch 'a' so 'b' becomes the oldest
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_cache_entry_expires(monkeypatch):
+    """Test that entries older than the TTL are dropped."""
+    now = [1000.0]
+    monkeypatch.setattr("bot.utils.cache.time.monotonic", lambda: now[0])
+
+    cache = TTLCache(maxsize=4, ttl=10)
+    cache.set("key", "value")
+
+    now[0] += 5
+    assert cache.get("key") == "value"
+
+    now[0] += 6
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_cache_without_ttl_never_expires(monkeypatch):
+    """Test that entries of a cache without TTL only leave by eviction."""
+    now = [1000.0]
+    monkeypatch.setattr("bot.utils.cache.time.monotonic", lambda: now[0])
+
+    cache = TTLCache(maxsize=4, ttl=None)
+    cache.set("key", "value")
+
+    now[0] += 10 ** 9
+    assert cache.get("key") == "value"
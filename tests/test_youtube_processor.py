@@ -0,0 +1,38 @@
+"""Tests for YouTube caption parsing."""
+from bot.content_processors.youtube_processor import YouTubeProcessor
+
+
+def _parse_vtt(content):
+    """Parse VTT content without setting up a processor."""
+    return YouTubeProcessor.__new__(YouTubeProcessor)._parse_vtt(content)
+
+
+def test_parse_vtt_skips_headers_and_timings():
+    """Test that only caption text is kept, without tags."""
+    content = (
+        "WEBVTT\n"
+        "Kind: captions\n"
+        "\n"
+        "1\n"
+        "00:00:00.000 --> 00:00:02.000\n"
+        "Hello <c>world</c>\n"
+        "\n"
+        "NOTE a comment\n"
+        "\n"
+        "2\n"
+        "00:00:02.000 --> 00:00:04.000 align:start\n"
+        "  second line\n"
+    )
+    assert _parse_vtt(content) == "Kind: captions Hello world second line"
+
+
+def test_parse_vtt_keeps_lines_starting_with_other_whitespace():
+    """Test that caption lines indented with non-breaking or other spaces are kept."""
+    content = (
+        "WEBVTT\n"
+        "\n"
+        "00:00:00.000 --> 00:00:02.000\n"
+        " indented caption\n"
+        "\x0bvertical tab caption\n"
+    )
+    assert _parse_vtt(content) == "indented caption vertical tab caption"